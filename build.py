@@ -33,11 +33,16 @@ extern "Python" void on_completion_fn(uintptr_t, tb_client_t, tb_packet_t*, cons
 
 ffibuilder.cdef(defs)
 
+# API (out-of-line) mode: the generated wrappers release the GIL around every
+# call into tb_client, so no hand-written `Py_BEGIN_ALLOW_THREADS` shim is needed.
 ffibuilder.set_source(
     "tigerbeetle_py._native.tb_client",
     c_header,
     libraries=["tb_client"],
     library_dirs=[lib_dir.as_posix()],
+    # No `-march=native`: the extension ships in wheels that must run on any
+    # CPU of the target architecture.
+    extra_compile_args=["-O3"],
     extra_link_args=[f"-Wl,-rpath,{lib_dir.as_posix()}"],
 )
 
@@ -1,12 +1,16 @@
 """Python client for TigerBeetle."""
 
+import array
+import asyncio
+import logging
+import re
+import struct
+import sys
 import threading
-import uuid
-from collections.abc import Iterator
-from contextlib import contextmanager
-from dataclasses import dataclass
-from types import TracebackType
-from typing import ClassVar
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager, suppress
+from itertools import chain
 
 from tigerbeetle_py._native import tb_client
 from tigerbeetle_py._types import bindings, errors, uint
@@ -14,136 +18,574 @@ from tigerbeetle_py._types import bindings, errors, uint
 ffi = tb_client.ffi
 lib = tb_client.lib
 
+logger = logging.getLogger(__name__)
 
-@dataclass(slots=True)
-class Request:
-    id: int
-    packet: ffi.CData
-    result: ffi.CData
-    ready: threading.Event
-
-
-def handle_exception(
-    exception: type[BaseException],
-    exception_value: BaseException,
-    traceback: TracebackType,
-) -> None:
-    """Handle exceptions raised in the Zig client thread.
-
-    See [1] on why exceptions cannot be propagated there and have to be
-    re-raised here.
+# Little-endian layouts of the tb_client structs. A `tb_uint128_t` is packed as
+# two u64 in the order declared by the header (high, low).
+_ACCOUNT_STRUCT = struct.Struct("<12QQIIIHHQ")
+_TRANSFER_STRUCT = struct.Struct("<12QQIIIHHQ")
+_ACCOUNT_BALANCE_STRUCT = struct.Struct("<8QQ56x")
+_CREATE_RESULT_STRUCT = struct.Struct("<II")
+_UINT128_STRUCT = struct.Struct("<QQ")
 
-    [1]: https://cffi.readthedocs.io/en/latest/using.html#extern-python-reference
-    """
-    raise exception_value.with_traceback(traceback)
 
+class Request:
+    """State of one in-flight request, reused across submits."""
+
+    __slots__ = (
+        "count",
+        "done",
+        "error",
+        "future",
+        "handle",
+        "loop",
+        "out_packet",
+        "packet",
+        "ready",
+        "result",
+    )
 
-@ffi.def_extern(onerror=handle_exception)
+    def __init__(self) -> None:
+        self.packet: ffi.CData = ffi.NULL
+        # Out-parameter for `tb_client_acquire_packet`, allocated once.
+        self.out_packet = ffi.new("tb_packet_t * *")
+        self.count = 0
+        self.result = b""
+        # A plain lock used as a one-shot signal: held while the request is in
+        # flight, released by the completion callback, and re-taken by the
+        # waiter, which leaves it held again for the next submit.
+        self.ready = threading.Lock()
+        self.ready.acquire()
+        # Set by the completion callback before it releases `ready`, so a
+        # waiter that was interrupted can tell whether the reply is in.
+        self.done = False
+        # Set instead of `ready` for requests awaited from an event loop.
+        self.future: asyncio.Future[None] | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        # Set by the completion callback if it failed on the Zig thread.
+        self.error: Exception | None = None
+        # The completion callback resolves this back to the request via
+        # `ffi.from_handle`, so it lives exactly as long as the request.
+        self.handle = ffi.new_handle(self)
+
+    def reset(self) -> None:
+        self.packet = ffi.NULL
+        self.count = 0
+        self.done = False
+        self.result = b""
+        self.future = None
+        self.loop = None
+        self.error = None
+
+
+@ffi.def_extern()
 def on_completion_fn(context, client, packet, result_ptr, result_len):
     """
     Simple statically registered extern "Python" fn. This gets
-    called for any callbacks, looks up the respective client from our
-    global mapping, and forwards on the callback.
+    called for any callbacks, recovers the respective request from the
+    handle stored in the packet's user data, and forwards on the callback.
 
-    NB: This runs in the Zig client thread.
+    NB: This runs in the Zig client thread. An exception raised here has
+    nowhere to go, so it is logged and stored on the request for the waiting
+    caller to raise instead.
     """
-    _on_completion_fn(context, client, packet, result_ptr, result_len)
+    try:
+        req = ffi.from_handle(packet.user_data)
+    except Exception:
+        logger.exception("Completion for a packet without a request")
+        return
+
+    try:
+        _on_completion_fn(req, packet, result_ptr, result_len)
+    except Exception as exc:
+        logger.exception("Failed to complete request")
+        req.error = exc
+
+    req.done = True
+    if req.future is None:
+        req.ready.release()
+    else:
+        req.loop.call_soon_threadsafe(req.future.set_result, None)
 
 
 def _on_completion_fn(
-    context: ffi.CData,
-    client: ffi.CData,
+    req: Request,
     packet: ffi.CData,
     result_ptr: ffi.CData,
-    result_len: ffi.CData,
+    result_len: int,
 ) -> None:
-    req = Client.inflight[int(ffi.cast("int", packet[0].user_data))]
     if req.packet != packet:
         raise Exception("Packet mismatch")
 
-    if result_len > 0 and result_ptr is not None:
-        op = bindings.Operation(int(packet.operation))
-        result_size = get_result_size(op)
-        if result_len % result_size != 0:
+    if result_len > 0 and result_ptr != ffi.NULL:
+        # `operation` is a plain u8 field, so this is already an `int`; the size
+        # tables are indexed by it directly without going through the enum.
+        op = packet.operation
+        results, rest = divmod(result_len, get_result_size(op))
+        if rest != 0:
             raise Exception("Invalid result length")
 
+        # Make sure the amount of results at least matches the amount of requests.
         if (
-            op != lib.TB_OPERATION_GET_ACCOUNT_TRANSFERS
-            and op != lib.TB_OPERATION_GET_ACCOUNT_BALANCES
+            op != _OP_GET_ACCOUNT_TRANSFERS
+            and op != _OP_GET_ACCOUNT_BALANCES
+            and results > req.count
         ):
-            # Make sure the amount of results at least matches the amount of requests.
-            count = packet.data_size // get_event_size(op)
-            if count * result_size < result_len:
-                raise Exception("Invalid result length")
-
-    req.result = result_ptr
-    req.packet.data_size = result_len
-    req.ready.set()
-
-
-def cint128_to_int(x: ffi.CData) -> uint.UInt128:
-    return uint.UInt128.from_tuple(x.high, x.low)
+            raise Exception("Invalid result length")
 
+        # `result_ptr` is only valid for the duration of this callback.
+        req.result = ffi.buffer(result_ptr, result_len)[:]
+
+
+# Operation codes as plain ints, so the request paths don't look up and convert
+# an enum member on every call.
+_OP_CREATE_ACCOUNTS = int(bindings.Operation.CREATE_ACCOUNTS)
+_OP_CREATE_TRANSFERS = int(bindings.Operation.CREATE_TRANSFERS)
+_OP_LOOKUP_ACCOUNTS = int(bindings.Operation.LOOKUP_ACCOUNTS)
+_OP_LOOKUP_TRANSFERS = int(bindings.Operation.LOOKUP_TRANSFERS)
+_OP_GET_ACCOUNT_TRANSFERS = int(bindings.Operation.GET_ACCOUNT_TRANSFERS)
+_OP_GET_ACCOUNT_BALANCES = int(bindings.Operation.GET_ACCOUNT_BALANCES)
+
+
+def _op_table(sizes: dict[int, int]) -> tuple[int, ...]:
+    """Spread `sizes` over a tuple indexed by the (u8) operation code."""
+    table = [0] * 256
+    for op, size in sizes.items():
+        table[op] = size
+    return tuple(table)
+
+
+# Sizes of the tb_client structs, resolved once so no `ffi.sizeof` type-name
+# lookup happens per request.
+_SZ_UINT128 = ffi.sizeof("tb_uint128_t")
+_SZ_ACCOUNT = ffi.sizeof("tb_account_t")
+_SZ_TRANSFER = ffi.sizeof("tb_transfer_t")
+_SZ_ACCOUNT_FILTER = ffi.sizeof("tb_account_filter_t")
+_SZ_ACCOUNT_BALANCE = ffi.sizeof("tb_account_balance_t")
+_SZ_CREATE_ACCOUNTS_RESULT = ffi.sizeof("tb_create_accounts_result_t")
+_SZ_CREATE_TRANSFERS_RESULT = ffi.sizeof("tb_create_transfers_result_t")
+
+_EVENT_SIZES = _op_table(
+    {
+        _OP_CREATE_ACCOUNTS: _SZ_ACCOUNT,
+        _OP_CREATE_TRANSFERS: _SZ_TRANSFER,
+        _OP_LOOKUP_ACCOUNTS: _SZ_UINT128,
+        _OP_LOOKUP_TRANSFERS: _SZ_UINT128,
+        _OP_GET_ACCOUNT_TRANSFERS: _SZ_ACCOUNT_FILTER,
+        _OP_GET_ACCOUNT_BALANCES: _SZ_ACCOUNT_FILTER,
+    }
+)
+_RESULT_SIZES = _op_table(
+    {
+        _OP_CREATE_ACCOUNTS: _SZ_CREATE_ACCOUNTS_RESULT,
+        _OP_CREATE_TRANSFERS: _SZ_CREATE_TRANSFERS_RESULT,
+        _OP_LOOKUP_ACCOUNTS: _SZ_ACCOUNT,
+        _OP_LOOKUP_TRANSFERS: _SZ_TRANSFER,
+        _OP_GET_ACCOUNT_TRANSFERS: _SZ_TRANSFER,
+        _OP_GET_ACCOUNT_BALANCES: _SZ_ACCOUNT_BALANCE,
+    }
+)
+
+
+def _struct_codes(fmt: str) -> str:
+    return "".join(
+        code if code == "x" else code * int(count or 1)
+        for count, code in re.findall(r"(\d*)(\D)", fmt.lstrip("<"))
+    )
 
-def get_event_size(op: bindings.Operation) -> int:
-    return {
-        lib.TB_OPERATION_CREATE_ACCOUNTS: ffi.sizeof("tb_account_t"),
-        lib.TB_OPERATION_CREATE_TRANSFERS: ffi.sizeof("tb_transfer_t"),
-        lib.TB_OPERATION_LOOKUP_ACCOUNTS: ffi.sizeof("tb_uint128_t"),
-        lib.TB_OPERATION_LOOKUP_TRANSFERS: ffi.sizeof("tb_uint128_t"),
-        lib.TB_OPERATION_GET_ACCOUNT_TRANSFERS: ffi.sizeof("tb_account_filter_t"),
-        lib.TB_OPERATION_GET_ACCOUNT_BALANCES: ffi.sizeof("tb_account_filter_t"),
-    }.get(op, 0)
 
+def _check_layout(
+    ctype: str,
+    layout: struct.Struct,
+    fields: list[tuple[str, str]],
+) -> None:
+    """Check that `layout` mirrors `ctype` field by field.
 
-def get_result_size(op: bindings.Operation) -> int:
-    return {
-        lib.TB_OPERATION_CREATE_ACCOUNTS: ffi.sizeof("tb_create_accounts_result_t"),
-        lib.TB_OPERATION_CREATE_TRANSFERS: ffi.sizeof("tb_create_transfers_result_t"),
-        lib.TB_OPERATION_LOOKUP_ACCOUNTS: ffi.sizeof("tb_account_t"),
-        lib.TB_OPERATION_LOOKUP_TRANSFERS: ffi.sizeof("tb_transfer_t"),
-        lib.TB_OPERATION_GET_ACCOUNT_TRANSFERS: ffi.sizeof("tb_account_t"),
-        lib.TB_OPERATION_GET_ACCOUNT_BALANCES: ffi.sizeof("tb_account_balance_t"),
-    }.get(op, 0)
+    `fields` pairs each C field, in declaration order, with its `struct`
+    format. Runs once at import so a header change cannot silently skew the
+    `pack_into`/`iter_unpack` codecs.
+    """
+    fmt = "<"
+    for name, code in fields:
+        assert ffi.offsetof(ctype, name) == struct.calcsize(fmt), (ctype, name)
+        fmt += code
+    # Compare the compiled layouts, so "12Q" and "QQ" * 6 count as equal.
+    assert _struct_codes(layout.format) == _struct_codes(fmt), ctype
+    assert ffi.sizeof(ctype) == layout.size, ctype
+
+
+_check_layout(
+    "tb_account_t",
+    _ACCOUNT_STRUCT,
+    [
+        ("id", "QQ"),
+        ("debits_pending", "QQ"),
+        ("debits_posted", "QQ"),
+        ("credits_pending", "QQ"),
+        ("credits_posted", "QQ"),
+        ("user_data_128", "QQ"),
+        ("user_data_64", "Q"),
+        ("user_data_32", "I"),
+        ("reserved", "I"),
+        ("ledger", "I"),
+        ("code", "H"),
+        ("flags", "H"),
+        ("timestamp", "Q"),
+    ],
+)
+_check_layout(
+    "tb_transfer_t",
+    _TRANSFER_STRUCT,
+    [
+        ("id", "QQ"),
+        ("debit_account_id", "QQ"),
+        ("credit_account_id", "QQ"),
+        ("amount", "QQ"),
+        ("pending_id", "QQ"),
+        ("user_data_128", "QQ"),
+        ("user_data_64", "Q"),
+        ("user_data_32", "I"),
+        ("timeout", "I"),
+        ("ledger", "I"),
+        ("code", "H"),
+        ("flags", "H"),
+        ("timestamp", "Q"),
+    ],
+)
+_check_layout(
+    "tb_account_balance_t",
+    _ACCOUNT_BALANCE_STRUCT,
+    [
+        ("debits_pending", "QQ"),
+        ("debits_posted", "QQ"),
+        ("credits_pending", "QQ"),
+        ("credits_posted", "QQ"),
+        ("timestamp", "Q"),
+        ("reserved", "56x"),
+    ],
+)
+_check_layout(
+    "tb_create_accounts_result_t",
+    _CREATE_RESULT_STRUCT,
+    [("index", "I"), ("result", "I")],
+)
+_check_layout(
+    "tb_create_transfers_result_t",
+    _CREATE_RESULT_STRUCT,
+    [("index", "I"), ("result", "I")],
+)
+_check_layout("tb_uint128_t", _UINT128_STRUCT, [("high", "Q"), ("low", "Q")])
+
+get_event_size = _EVENT_SIZES.__getitem__
+get_result_size = _RESULT_SIZES.__getitem__
+
+
+def _from_records(ctype: str, data: uint.Buffer) -> ffi.CData:
+    """Wrap a buffer of packed `ctype` records without copying it."""
+    nbytes = memoryview(data).nbytes
+    if nbytes % ffi.sizeof(ctype) != 0:
+        msg = f"Buffer of {nbytes} bytes does not hold whole {ctype} records"
+        raise ValueError(msg)
+    return ffi.from_buffer(f"{ctype}[]", data)
+
+
+def _compile_packer(
+    name: str,
+    ctype: str,
+    layout: struct.Struct,
+    fields: list[str],
+) -> Callable[[list | uint.Buffer], ffi.CData]:
+    """Generate a function packing a list of records into a new C array.
+
+    Buffers of already-packed records are wrapped as they are instead.
+
+    `fields` are the source expressions for each value of `layout`, in terms of
+    the row `r`. Compiling them into one specialized loop per record type
+    leaves a single `pack_into` call per row, with no field tables walked at
+    runtime.
+    """
+    args = ",\n            ".join(fields)
+    source = f"""\
+def {name}(rows):
+    if isinstance(rows, Buffer):
+        return from_records("{ctype}", rows)
+    batch = ffi_new("{ctype}[]", len(rows))
+    buf = ffi_buffer(batch)
+    for idx, r in enumerate(rows):
+        pack_into(
+            buf,
+            idx * {layout.size},
+            {args},
+        )
+    return batch
+"""
+    namespace = {
+        "ffi_new": ffi.new,
+        "ffi_buffer": ffi.buffer,
+        "pack_into": layout.pack_into,
+        "Buffer": uint.Buffer,
+        "from_records": _from_records,
+    }
+    exec(compile(source, f"<{name}>", "exec"), namespace)  # noqa: S102
+    return namespace[name]
+
+
+pack_accounts = _compile_packer(
+    "pack_accounts",
+    "tb_account_t",
+    _ACCOUNT_STRUCT,
+    [
+        "*r.id.tuple",
+        "0, 0, 0, 0, 0, 0, 0, 0",  # debits/credits pending/posted
+        "*r.user_data_128.tuple",
+        "r.user_data_64.int",
+        "r.user_data_32.int",
+        "0",  # reserved
+        "r.ledger.int",
+        "r.code.int",
+        "r.flags.int",
+        "0",  # timestamp
+    ],
+)
+
+pack_transfers = _compile_packer(
+    "pack_transfers",
+    "tb_transfer_t",
+    _TRANSFER_STRUCT,
+    [
+        "*r.id.tuple",
+        "*r.debit_account_id.tuple",
+        "*r.credit_account_id.tuple",
+        "*r.amount.tuple",
+        "*r.pending_id.tuple",
+        "*r.user_data_128.tuple",
+        "r.user_data_64.int",
+        "r.user_data_32.int",
+        "r.timeout.int",
+        "r.ledger.int",
+        "r.code.int",
+        "r.flags.int",
+        "0",  # timestamp
+    ],
+)
+
+
+def pack_ids(ids: list[uint.UInt128] | uint.Buffer) -> ffi.CData:
+    if isinstance(ids, uint.Buffer):
+        return _from_records("tb_uint128_t", ids)
+    # Flatten the (high, low) pairs into one native u64 array and lend its
+    # memory to tb_client; the returned cdata keeps the array alive.
+    halves = array.array("Q", chain.from_iterable([id_.tuple for id_ in ids]))
+    return ffi.from_buffer("tb_uint128_t[]", halves)
+
+
+def unpack_accounts(data: bytes) -> list[bindings.Account]:
+    from_hl = uint.UInt128._from_hl
+    return [
+        # Positional, in `Account` field order, to skip keyword binding.
+        bindings.Account(
+            from_hl(id_hi, id_lo),
+            uint.UInt32(ledger),
+            uint.UInt16(code),
+            from_hl(debits_pending_hi, debits_pending_lo),
+            from_hl(debits_posted_hi, debits_posted_lo),
+            from_hl(credits_pending_hi, credits_pending_lo),
+            from_hl(credits_posted_hi, credits_posted_lo),
+            from_hl(user_data_128_hi, user_data_128_lo),
+            uint.UInt64(user_data_64),
+            uint.UInt32(user_data_32),
+            uint.UInt16(flags),
+            uint.UInt64(timestamp),
+            reserved,
+        )
+        for (
+            id_hi,
+            id_lo,
+            debits_pending_hi,
+            debits_pending_lo,
+            debits_posted_hi,
+            debits_posted_lo,
+            credits_pending_hi,
+            credits_pending_lo,
+            credits_posted_hi,
+            credits_posted_lo,
+            user_data_128_hi,
+            user_data_128_lo,
+            user_data_64,
+            user_data_32,
+            reserved,
+            ledger,
+            code,
+            flags,
+            timestamp,
+        ) in _ACCOUNT_STRUCT.iter_unpack(data)
+    ]
+
+
+def unpack_transfers(data: bytes) -> list[bindings.Transfer]:
+    from_hl = uint.UInt128._from_hl
+    return [
+        # Positional, in `Transfer` field order, to skip keyword binding.
+        bindings.Transfer(
+            from_hl(id_hi, id_lo),
+            from_hl(debit_account_id_hi, debit_account_id_lo),
+            from_hl(credit_account_id_hi, credit_account_id_lo),
+            from_hl(amount_hi, amount_lo),
+            uint.UInt32(ledger),
+            uint.UInt16(code),
+            from_hl(pending_id_hi, pending_id_lo),
+            from_hl(user_data_128_hi, user_data_128_lo),
+            uint.UInt64(user_data_64),
+            uint.UInt32(user_data_32),
+            uint.UInt32(timeout),
+            uint.UInt16(flags),
+            uint.UInt64(timestamp),
+        )
+        for (
+            id_hi,
+            id_lo,
+            debit_account_id_hi,
+            debit_account_id_lo,
+            credit_account_id_hi,
+            credit_account_id_lo,
+            amount_hi,
+            amount_lo,
+            pending_id_hi,
+            pending_id_lo,
+            user_data_128_hi,
+            user_data_128_lo,
+            user_data_64,
+            user_data_32,
+            timeout,
+            ledger,
+            code,
+            flags,
+            timestamp,
+        ) in _TRANSFER_STRUCT.iter_unpack(data)
+    ]
+
+
+def unpack_account_balances(data: bytes) -> list[bindings.AccountBalance]:
+    from_hl = uint.UInt128._from_hl
+    return [
+        bindings.AccountBalance(
+            from_hl(debits_pending_hi, debits_pending_lo),
+            from_hl(debits_posted_hi, debits_posted_lo),
+            from_hl(credits_pending_hi, credits_pending_lo),
+            from_hl(credits_posted_hi, credits_posted_lo),
+            uint.UInt64(timestamp),
+        )
+        for (
+            debits_pending_hi,
+            debits_pending_lo,
+            debits_posted_hi,
+            debits_posted_lo,
+            credits_pending_hi,
+            credits_pending_lo,
+            credits_posted_hi,
+            credits_posted_lo,
+            timestamp,
+        ) in _ACCOUNT_BALANCE_STRUCT.iter_unpack(data)
+    ]
+
+
+def pack_account_filter(filt: bindings.AccountFilter) -> ffi.CData:
+    batch = ffi.new("tb_account_filter_t[]", 1)
+
+    batch[0].account_id = filt.account_id.tuple
+    batch[0].timestamp_min = filt.timestamp_min.int
+    batch[0].timestamp_max = filt.timestamp_max.int
+    batch[0].limit = filt.limit.int
+    batch[0].flags = filt.flags.int
+
+    return batch
+
+
+def unpack_create_accounts_results(
+    data: bytes,
+    count: int,
+) -> list[bindings.CreateAccountsResult]:
+    # The reply only lists the events that failed, so start from all-OK and
+    # overwrite those in place.
+    ok = bindings.CreateAccountResult.OK
+    results = bindings._CREATE_ACCOUNT_RESULTS
+    merged = [bindings.CreateAccountsResult(idx, ok) for idx in range(count)]
+    for idx, result in _CREATE_RESULT_STRUCT.iter_unpack(data):
+        try:
+            code = results[result]
+        except IndexError:
+            # A code this client doesn't know, e.g. from a newer server, so
+            # let the enum raise its usual `ValueError`.
+            code = bindings.CreateAccountResult(result)
+        merged[idx] = bindings.CreateAccountsResult(idx, code)
+    return merged
+
+
+def unpack_create_transfers_results(
+    data: bytes,
+    count: int,
+) -> list[bindings.CreateTransfersResult]:
+    ok = bindings.CreateTransferResult.OK
+    results = bindings._CREATE_TRANSFER_RESULTS
+    merged = [bindings.CreateTransfersResult(idx, ok) for idx in range(count)]
+    for idx, result in _CREATE_RESULT_STRUCT.iter_unpack(data):
+        try:
+            code = results[result]
+        except IndexError:
+            code = bindings.CreateTransferResult(result)
+        merged[idx] = bindings.CreateTransfersResult(idx, code)
+    return merged
 
 
 @contextmanager
-def request_ctx(c: ffi.CData, packet: ffi.CData | None = None) -> Iterator[Request]:
-    if packet is None:
-        packet = ffi.new("tb_packet_t *")
-
-    status = lib.tb_client_acquire_packet(
-        c[0],
-        ffi.new("tb_packet_t * *", packet),
-    )
-    if status == lib.TB_STATUS_CONCURRENCY_MAX_INVALID:
-        raise errors.ConcurrencyExceededError()
-    if status == lib.TB_PACKET_ACQUIRE_SHUTDOWN:
-        raise errors.ClientClosedError()
-    if packet is None:
+def request_ctx(
+    c: ffi.CData,
+    pool: list[Request],
+    loop: asyncio.AbstractEventLoop | None = None,
+) -> Iterator[Request]:
+    try:
+        req = pool.pop()
+    except IndexError:
+        req = Request()
+
+    # tb_client preallocates `concurrency_max` packets at init and hands them
+    # out here, so there is no per-request packet allocation on our side.
+    status = lib.tb_client_acquire_packet(c[0], req.out_packet)
+    if status != lib.TB_PACKET_ACQUIRE_OK:
+        pool.append(req)
+        if status == lib.TB_PACKET_ACQUIRE_CONCURRENCY_MAX_EXCEEDED:
+            raise errors.ConcurrencyExceededError()
+        if status == lib.TB_PACKET_ACQUIRE_SHUTDOWN:
+            raise errors.ClientClosedError()
+        msg = f"Unexpected packet acquire status: {status}"
+        raise errors.TigerBeetleError(msg)
+    packet = req.out_packet[0]
+    if packet == ffi.NULL:
+        pool.append(req)
         raise errors.TigerBeetleError("Unexpected None packet")
 
-    req = Request(
-        id=uuid.uuid4().int & 0x7FFFFFFF,
-        packet=packet,
-        result=None,
-        ready=threading.Event(),
-    )
+    req.packet = packet
+    packet.user_data = req.handle
+    if loop is not None:
+        req.loop = loop
+        req.future = loop.create_future()
 
     try:
         yield req
     finally:
         # Release packet for other threads to use
         lib.tb_client_release_packet(c[0], packet)
-        del Client.inflight[req.id]
+
+    # Only recycle requests that completed normally: one abandoned mid-wait
+    # could still be signalled by a late callback.
+    req.reset()
+    pool.append(req)
 
 
 # TODO: ensure endianness is correct
 class Client:
     """Client for TigerBeetle."""
 
-    inflight: ClassVar[dict[int, Request]] = {}
-
     def __init__(
         self,
         cluster_id: uint.UInt128,
@@ -151,12 +593,18 @@ class Client:
         concurrency_max: int,
     ) -> None:
         self._tb_client: ffi.CData | None = ffi.new("tb_client_t *")
-        addresses_raw = ",".join(addresses).encode()
+        # Free list of `Request`s, bounded in practice by `concurrency_max`.
+        self._requests: list[Request] = []
+        # tb_client_init parses the addresses before returning, but the buffer
+        # is kept for the client's lifetime anyway so no pointer handed to
+        # tb_client can ever dangle. `from_buffer` shares the bytes' memory
+        # rather than copying it into a new `char[]`.
+        self._addresses = ffi.from_buffer("char[]", ",".join(addresses).encode())
         status = lib.tb_client_init(
             self._tb_client,
             cluster_id.tuple,
-            ffi.new("char[]", addresses_raw),
-            len(addresses_raw),
+            self._addresses,
+            len(self._addresses),
             concurrency_max,
             0,
             lib.on_completion_fn,
@@ -186,53 +634,167 @@ class Client:
                 msg = f"Unexpected status: {status}"
                 raise errors.TigerBeetleError(msg)
 
-    def _do_request(
-        self,
-        op: bindings.Operation,
-        count: int,
-        data: ffi.CData,
-        result_type: str,
-    ) -> int:
+    @staticmethod
+    def _raise_packet_status(status: int) -> None:
+        match status:
+            case lib.TB_PACKET_TOO_MUCH_DATA:
+                raise errors.MaximumBatchSizeExceededError()
+            case lib.TB_PACKET_INVALID_OPERATION:
+                # we control what lib.TB_OPERATION is given
+                # but allow an invalid opcode to be passed to emulate a client nop
+                raise errors.InvalidOperationError()
+            case lib.TB_PACKET_INVALID_DATA_SIZE:
+                # we control what type of data is given
+                raise Exception("unreachable")
+            case _:
+                raise Exception(
+                    "tb_client_submit(): returned packet with invalid status"
+                )
+
+    def _check_request(self, count: int) -> ffi.CData:
         if count == 0:
             raise errors.EmptyBatchError()
 
         if self._tb_client is None:
             raise errors.ClientClosedError()
 
-        with request_ctx(self._tb_client) as req:
-            req.packet.user_data = ffi.cast("void *", req.id)
-            req.packet.operation = ffi.cast("TB_OPERATION", op.value)
-            req.packet.status = lib.TB_PACKET_OK
-            req.packet.data_size = count * get_event_size(op)
-            req.packet.data = data
-
-            Client.inflight[req.id] = req
-
-            # Submit the request.
-            lib.tb_client_submit(self._tb_client[0], req.packet)
-
-            # Wait for the response
-            req.ready.wait()
-
-            status = int(ffi.cast("TB_PACKET_STATUS", req.packet.status))
-            if status != lib.TB_PACKET_OK:
-                match status:
-                    case lib.TB_PACKET_TOO_MUCH_DATA:
-                        raise errors.MaximumBatchSizeExceededError()
-                    case lib.TB_PACKET_INVALID_OPERATION:
-                        # we control what lib.TB_OPERATION is given
-                        # but allow an invalid opcode to be passed to emulate a client nop
-                        raise errors.InvalidOperationError()
-                    case lib.TB_PACKET_INVALID_DATA_SIZE:
-                        # we control what type of data is given
-                        raise Exception("unreachable")
-                    case _:
-                        raise Exception(
-                            "tb_client_submit(): returned packet with invalid status"
-                        )
+        return self._tb_client
 
-            result_count = req.packet.data_size // get_result_size(op)
-            return ffi.cast(result_type.format(count=result_count), req.result)
+    def _submit(
+        self,
+        req: Request,
+        op: int,
+        count: int,
+        data: ffi.CData,
+    ) -> None:
+        # Only the fields we own are written: `next` and `batch_*` belong to
+        # tb_client, so the packet cannot be stamped from a template.
+        # `operation` and `status` are plain u8 fields: ints go straight in and
+        # come straight out, with no enum cast either way.
+        packet = req.packet
+        packet.operation = op
+        packet.status = lib.TB_PACKET_OK
+        packet.data_size = count * get_event_size(op)
+        packet.data = data
+        # Saves the callback from dividing `data_size` back by the event size.
+        req.count = count
+
+        # Submit the request. CFFI's API mode drops the GIL for the duration
+        # of every call into `tb_client`, so other threads keep running.
+        lib.tb_client_submit(self._tb_client[0], packet)
+
+    def _result(self, req: Request) -> bytes:
+        if req.error is not None:
+            raise req.error
+
+        status = req.packet.status
+        if status != lib.TB_PACKET_OK:
+            self._raise_packet_status(status)
+
+        return req.result
+
+    def _do_request(
+        self,
+        op: int,
+        count: int,
+        data: ffi.CData,
+    ) -> bytes:
+        tb_client = self._check_request(count)
+
+        with request_ctx(tb_client, self._requests) as req:
+            self._submit(req, op, count, data)
+
+            # Wait for the response. Blocking on the lock releases the GIL
+            # until the completion callback hands it back from the Zig thread.
+            req.ready.acquire()
+
+            return self._result(req)
+
+    def _do_requests(
+        self,
+        op: int,
+        batches: list[tuple[int, ffi.CData]],
+    ) -> list[bytes]:
+        """Submit `batches` back to back and wait for all of their replies.
+
+        Packets are submitted while tb_client has any to hand out; once it
+        runs out, the oldest outstanding request is waited for to free one.
+        """
+        results = [b""] * len(batches)
+        pending: deque[tuple[int, ExitStack, Request]] = deque()
+
+        def wait_oldest() -> None:
+            # The entry stays in `pending` until its reply is in, so an
+            # interrupted wait still leaves it to the cleanup below.
+            idx, stack, req = pending[0]
+            req.ready.acquire()
+            pending.popleft()
+            with stack:
+                results[idx] = self._result(req)
+
+        # Every batch is checked before the first is submitted, so a bad one
+        # can't fail the call after earlier batches were already committed.
+        for count, _ in batches:
+            tb_client = self._check_request(count)
+
+        try:
+            for idx, (count, data) in enumerate(batches):
+                while True:
+                    stack = ExitStack()
+                    try:
+                        req = stack.enter_context(
+                            request_ctx(tb_client, self._requests)
+                        )
+                    except errors.ConcurrencyExceededError:
+                        if not pending:
+                            raise
+                        wait_oldest()
+                    else:
+                        break
+                self._submit(req, op, count, data)
+                pending.append((idx, stack, req))
+
+            while pending:
+                wait_oldest()
+        except BaseException:
+            # tb_client owns the submitted packets until their replies arrive.
+            # `done` tells whether one is in, because an interrupted
+            # `wait_oldest` may already hold `ready`. The requests are closed
+            # with the exception so that they are dropped, not recycled: one
+            # may still see a late `ready.release()`.
+            exc_info = sys.exc_info()
+            for _, stack, req in pending:
+                if not req.done:
+                    req.ready.acquire()
+                stack.__exit__(*exc_info)
+            raise
+
+        return results
+
+    async def _do_request_async(
+        self,
+        op: int,
+        count: int,
+        data: ffi.CData,
+    ) -> bytes:
+        tb_client = self._check_request(count)
+
+        with request_ctx(tb_client, self._requests, asyncio.get_running_loop()) as req:
+            self._submit(req, op, count, data)
+
+            # The completion callback resolves the future from the Zig thread
+            # through `call_soon_threadsafe`. tb_client owns the packet until
+            # then, so a cancelled caller must still wait for the reply before
+            # the packet can be released, however often it is cancelled again.
+            try:
+                await asyncio.shield(req.future)
+            except asyncio.CancelledError:
+                while not req.future.done():
+                    with suppress(asyncio.CancelledError):
+                        await asyncio.shield(req.future)
+                raise
+
+            return self._result(req)
 
     def close(self) -> None:
         if self._tb_client is not None:
@@ -241,183 +803,91 @@ class Client:
 
     def create_accounts(
         self,
-        accounts: list[bindings.Account],
+        accounts: list[bindings.Account] | uint.Buffer,
     ) -> list[bindings.CreateAccountsResult]:
         """Create accounts in the ledger.
 
         Args:
-            accounts: List of accounts to create.
+            accounts: List of accounts to create, or a buffer of packed
+                little-endian `tb_account_t` records, which is submitted
+                without copying.
 
         Returns:
             List of account creation results.
         """
-        count = len(accounts)
-
-        batch = ffi.new("tb_account_t[]", count)
-        for idx, account in enumerate(accounts):
-            batch[idx].id = account.id.tuple
-            batch[idx].ledger = account.ledger.int
-            batch[idx].code = account.code.int
-            batch[idx].flags = account.flags.int
-            batch[idx].user_data_128 = account.user_data_128.tuple
-            batch[idx].user_data_64 = account.user_data_64.int
-            batch[idx].user_data_32 = account.user_data_32.int
-            batch[idx].timestamp = 0
-
+        batch = pack_accounts(accounts)
+        count = len(batch)
         results = self._do_request(
-            bindings.Operation.CREATE_ACCOUNTS,
+            _OP_CREATE_ACCOUNTS,
             count,
             batch,
-            "tb_create_accounts_result_t[{count}]",
         )
-        results_by_idx = {result.index: result for result in results}
-
-        return [
-            bindings.CreateAccountsResult(
-                results_by_idx[idx].index,
-                bindings.CreateAccountResult(results_by_idx[idx].result),
-            )
-            if idx in results_by_idx
-            else bindings.CreateAccountsResult(
-                idx,
-                bindings.CreateAccountResult(bindings.CreateAccountResult.OK),
-            )
-            for idx in range(count)
-        ]
+        return unpack_create_accounts_results(results, count)
 
     def create_transfers(
         self,
-        transfers: list[bindings.Transfer],
+        transfers: list[bindings.Transfer] | uint.Buffer,
     ) -> list[bindings.CreateTransfersResult]:
         """Create transfers in the ledger.
 
         Args:
-            transfers: List of transfers to create.
+            transfers: List of transfers to create, or a buffer of packed
+                little-endian `tb_transfer_t` records, which is submitted
+                without copying.
 
         Returns:
             List of transfer creation results.
         """
-        count = len(transfers)
-        # results = ffi.new("tb_create_transfers_result_t[]", count)
-
-        batch = ffi.new("tb_transfer_t[]", count)
-        for idx, transfer in enumerate(transfers):
-            batch[idx].id = transfer.id.tuple
-            batch[idx].debit_account_id = transfer.debit_account_id.tuple
-            batch[idx].credit_account_id = transfer.credit_account_id.tuple
-            batch[idx].amount = transfer.amount.tuple
-            batch[idx].pending_id = transfer.pending_id.tuple
-            batch[idx].user_data_128 = transfer.user_data_128.tuple
-            batch[idx].user_data_64 = transfer.user_data_64.int
-            batch[idx].user_data_32 = transfer.user_data_32.int
-            batch[idx].timeout = transfer.timeout.int
-            batch[idx].ledger = transfer.ledger.int
-            batch[idx].code = transfer.code.int
-            batch[idx].flags = transfer.flags.int
-            batch[idx].timestamp = 0
-
+        batch = pack_transfers(transfers)
+        count = len(batch)
         results = self._do_request(
-            bindings.Operation.CREATE_TRANSFERS,
+            _OP_CREATE_TRANSFERS,
             count,
             batch,
-            "tb_create_transfers_result_t[{count}]",
         )
-        results_by_idx = {result.index: result for result in results}
-
-        return [
-            bindings.CreateTransfersResult(
-                results_by_idx[idx].index,
-                bindings.CreateTransferResult(results_by_idx[idx].result),
-            )
-            if idx in results_by_idx
-            else bindings.CreateTransfersResult(
-                idx,
-                bindings.CreateTransferResult(bindings.CreateTransferResult.OK),
-            )
-            for idx in range(count)
-        ]
+        return unpack_create_transfers_results(results, count)
 
     def lookup_accounts(
         self,
-        account_ids: list[uint.UInt128],
+        account_ids: list[uint.UInt128] | uint.Buffer,
     ) -> list[bindings.Account]:
         """Lookup accounts in the ledger.
 
         Args:
-            account_ids: List of account IDs to look up.
+            account_ids: List of account IDs to look up, or a buffer of
+                packed `tb_uint128_t` records (`<QQ`, high then low).
 
         Returns:
             List of account dictionaries.
         """
-        count = len(account_ids)
-        batch = ffi.new("tb_uint128_t[]", [i.tuple for i in account_ids])
-
+        batch = pack_ids(account_ids)
         results = self._do_request(
-            bindings.Operation.LOOKUP_ACCOUNTS,
-            count,
+            _OP_LOOKUP_ACCOUNTS,
+            len(batch),
             batch,
-            "tb_account_t[{count}]",
         )
-
-        return [
-            bindings.Account(
-                id=cint128_to_int(result.id),
-                debits_pending=cint128_to_int(result.debits_pending),
-                debits_posted=cint128_to_int(result.debits_posted),
-                credits_pending=cint128_to_int(result.credits_pending),
-                credits_posted=cint128_to_int(result.credits_posted),
-                user_data_128=cint128_to_int(result.user_data_128),
-                user_data_64=uint.UInt64(result.user_data_64),
-                user_data_32=uint.UInt32(result.user_data_32),
-                ledger=uint.UInt32(result.ledger),
-                code=uint.UInt16(result.code),
-                flags=uint.UInt16(result.flags),
-                timestamp=uint.UInt64(result.timestamp),
-                reserved=result.reserved,
-            )
-            for result in results
-        ]
+        return unpack_accounts(results)
 
     def lookup_transfers(
         self,
-        transfer_ids: list[uint.UInt128],
+        transfer_ids: list[uint.UInt128] | uint.Buffer,
     ) -> list[bindings.Transfer]:
         """Lookup transfers in the ledger.
 
         Args:
-            transfer_ids: List of transfer IDs to look up.
+            transfer_ids: List of transfer IDs to look up, or a buffer of
+                packed `tb_uint128_t` records (`<QQ`, high then low).
 
         Returns:
             List of transfer dictionaries.
         """
-        count = len(transfer_ids)
-        batch = ffi.new("tb_uint128_t[]", [i.tuple for i in transfer_ids])
-
+        batch = pack_ids(transfer_ids)
         results = self._do_request(
-            bindings.Operation.LOOKUP_TRANSFERS,
-            count,
+            _OP_LOOKUP_TRANSFERS,
+            len(batch),
             batch,
-            "tb_transfer_t[{count}]",
         )
-
-        return [
-            bindings.Transfer(
-                id=cint128_to_int(result.id),
-                debit_account_id=cint128_to_int(result.debit_account_id),
-                credit_account_id=cint128_to_int(result.credit_account_id),
-                amount=cint128_to_int(result.amount),
-                pending_id=cint128_to_int(result.pending_id),
-                user_data_128=cint128_to_int(result.user_data_128),
-                user_data_64=uint.UInt64(result.user_data_64),
-                user_data_32=uint.UInt32(result.user_data_32),
-                timeout=uint.UInt32(result.timeout),
-                ledger=uint.UInt32(result.ledger),
-                code=uint.UInt16(result.code),
-                flags=uint.UInt16(result.flags),
-                timestamp=uint.UInt64(result.timestamp),
-            )
-            for result in results
-        ]
+        return unpack_transfers(results)
 
     def get_account_transfers(
         self,
@@ -431,39 +901,12 @@ class Client:
         Returns:
             List of transfers.
         """
-        batch = ffi.new("tb_account_filter_t[]", 1)
-
-        batch[0].account_id = filt.account_id.tuple
-        batch[0].timestamp_min = filt.timestamp_min.int
-        batch[0].timestamp_max = filt.timestamp_max.int
-        batch[0].limit = filt.limit.int
-        batch[0].flags = filt.flags.int
-
         results = self._do_request(
-            bindings.Operation.GET_ACCOUNT_TRANSFERS,
+            _OP_GET_ACCOUNT_TRANSFERS,
             1,
-            batch,
-            "tb_transfer_t[{count}]",
+            pack_account_filter(filt),
         )
-
-        return [
-            bindings.Transfer(
-                id=cint128_to_int(result.id),
-                debit_account_id=cint128_to_int(result.debit_account_id),
-                credit_account_id=cint128_to_int(result.credit_account_id),
-                amount=cint128_to_int(result.amount),
-                pending_id=cint128_to_int(result.pending_id),
-                user_data_128=cint128_to_int(result.user_data_128),
-                user_data_64=uint.UInt64(result.user_data_64),
-                user_data_32=uint.UInt32(result.user_data_32),
-                timeout=uint.UInt32(result.timeout),
-                ledger=uint.UInt32(result.ledger),
-                code=uint.UInt16(result.code),
-                flags=uint.UInt16(result.flags),
-                timestamp=uint.UInt64(result.timestamp),
-            )
-            for result in results
-        ]
+        return unpack_transfers(results)
 
     def get_account_balances(
         self,
@@ -477,28 +920,151 @@ class Client:
         Returns:
             List of account balances.
         """
-        batch = ffi.new("tb_account_filter_t[]", 1)
-
-        batch[0].account_id = filt.account_id.tuple
-        batch[0].timestamp_min = filt.timestamp_min.int
-        batch[0].timestamp_max = filt.timestamp_max.int
-        batch[0].limit = filt.limit.int
-        batch[0].flags = filt.flags.int
-
         results = self._do_request(
-            bindings.Operation.GET_ACCOUNT_BALANCES,
+            _OP_GET_ACCOUNT_BALANCES,
             1,
-            batch,
-            "tb_account_balance_t[{count}]",
+            pack_account_filter(filt),
+        )
+        return unpack_account_balances(results)
+
+    def create_accounts_many(
+        self,
+        batches: list[list[bindings.Account] | uint.Buffer],
+    ) -> list[list[bindings.CreateAccountsResult]]:
+        """Create several batches of accounts with their requests in flight at once.
+
+        Args:
+            batches: Lists (or buffers, see `create_accounts`) of accounts, each
+                submitted as one request.
+
+        Returns:
+            Account creation results, one list per batch.
+        """
+        packed = [pack_accounts(batch) for batch in batches]
+        results = self._do_requests(
+            _OP_CREATE_ACCOUNTS,
+            [(len(batch), batch) for batch in packed],
         )
+        return [
+            unpack_create_accounts_results(data, len(batch))
+            for data, batch in zip(results, packed)
+        ]
+
+    def create_transfers_many(
+        self,
+        batches: list[list[bindings.Transfer] | uint.Buffer],
+    ) -> list[list[bindings.CreateTransfersResult]]:
+        """Create several batches of transfers with their requests in flight at once.
 
+        Args:
+            batches: Lists (or buffers, see `create_transfers`) of transfers, each
+                submitted as one request.
+
+        Returns:
+            Transfer creation results, one list per batch.
+        """
+        packed = [pack_transfers(batch) for batch in batches]
+        results = self._do_requests(
+            _OP_CREATE_TRANSFERS,
+            [(len(batch), batch) for batch in packed],
+        )
         return [
-            bindings.AccountBalance(
-                debits_pending=cint128_to_int(result.debits_pending),
-                debits_posted=cint128_to_int(result.debits_posted),
-                credits_pending=cint128_to_int(result.credits_pending),
-                credits_posted=cint128_to_int(result.credits_posted),
-                timestamp=uint.UInt64(result.timestamp),
-            )
-            for result in results
+            unpack_create_transfers_results(data, len(batch))
+            for data, batch in zip(results, packed)
         ]
+
+    async def create_accounts_async(
+        self,
+        accounts: list[bindings.Account] | uint.Buffer,
+    ) -> list[bindings.CreateAccountsResult]:
+        """Create accounts in the ledger without blocking the event loop.
+
+        See `create_accounts`.
+        """
+        batch = pack_accounts(accounts)
+        count = len(batch)
+        results = await self._do_request_async(
+            _OP_CREATE_ACCOUNTS,
+            count,
+            batch,
+        )
+        return unpack_create_accounts_results(results, count)
+
+    async def create_transfers_async(
+        self,
+        transfers: list[bindings.Transfer] | uint.Buffer,
+    ) -> list[bindings.CreateTransfersResult]:
+        """Create transfers in the ledger without blocking the event loop.
+
+        See `create_transfers`.
+        """
+        batch = pack_transfers(transfers)
+        count = len(batch)
+        results = await self._do_request_async(
+            _OP_CREATE_TRANSFERS,
+            count,
+            batch,
+        )
+        return unpack_create_transfers_results(results, count)
+
+    async def lookup_accounts_async(
+        self,
+        account_ids: list[uint.UInt128] | uint.Buffer,
+    ) -> list[bindings.Account]:
+        """Lookup accounts in the ledger without blocking the event loop.
+
+        See `lookup_accounts`.
+        """
+        batch = pack_ids(account_ids)
+        results = await self._do_request_async(
+            _OP_LOOKUP_ACCOUNTS,
+            len(batch),
+            batch,
+        )
+        return unpack_accounts(results)
+
+    async def lookup_transfers_async(
+        self,
+        transfer_ids: list[uint.UInt128] | uint.Buffer,
+    ) -> list[bindings.Transfer]:
+        """Lookup transfers in the ledger without blocking the event loop.
+
+        See `lookup_transfers`.
+        """
+        batch = pack_ids(transfer_ids)
+        results = await self._do_request_async(
+            _OP_LOOKUP_TRANSFERS,
+            len(batch),
+            batch,
+        )
+        return unpack_transfers(results)
+
+    async def get_account_transfers_async(
+        self,
+        filt: bindings.AccountFilter,
+    ) -> list[bindings.Transfer]:
+        """Get transfers for an account without blocking the event loop.
+
+        See `get_account_transfers`.
+        """
+        results = await self._do_request_async(
+            _OP_GET_ACCOUNT_TRANSFERS,
+            1,
+            pack_account_filter(filt),
+        )
+        return unpack_transfers(results)
+
+    async def get_account_balances_async(
+        self,
+        filt: bindings.AccountFilter,
+    ) -> list[bindings.AccountBalance]:
+        """Get balances for an account without blocking the event loop.
+
+        See `get_account_balances`.
+        """
+        results = await self._do_request_async(
+            _OP_GET_ACCOUNT_BALANCES,
+            1,
+            pack_account_filter(filt),
+        )
+        return unpack_account_balances(results)
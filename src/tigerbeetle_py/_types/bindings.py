@@ -2,9 +2,32 @@
 
 import enum
 from dataclasses import dataclass
+from typing import TypeVar
 
 from tigerbeetle_py._types import uint
 
+_T = TypeVar("_T")
+
+# Shared field defaults. The uints are never mutated, so every record can
+# reference the same instances.
+_UINT32_ZERO = uint.UInt32(0)
+_UINT64_ZERO = uint.UInt64(0)
+_UINT128_ZERO = uint.UInt128(0)
+
+
+def _flags_table(cls: type[_T]) -> tuple[_T, ...]:
+    """Build every combination of the flag bits, indexed by their packed value.
+
+    The fields of the flag classes are declared in bit order, so bit `i` of
+    the index is passed as the `i`-th positional argument. The flag classes
+    are frozen, so decoding can hand out these shared instances.
+    """
+    n_bits = len(cls.__slots__)
+    return tuple(
+        cls(*(bool(bits >> idx & 1) for idx in range(n_bits)))
+        for bits in range(1 << n_bits)
+    )
+
 
 @dataclass(slots=True, frozen=True)
 class AccountFlags:
@@ -21,14 +44,19 @@ class AccountFlags:
 
     def to_uint16(self) -> uint.UInt16:
         """Convert to a `UInt16`."""
-        return uint.UInt16(
-            (self.linked << 0)
-            | (self.debits_must_not_exceed_credits << 1)
-            | (self.credits_must_not_exceed_debits << 2)
-            | (self.history << 3)
+        # The bits can't exceed the width, so the range checks are skipped.
+        return uint.UInt16._from_int(
+            self.linked
+            | self.debits_must_not_exceed_credits << 1
+            | self.credits_must_not_exceed_debits << 2
+            | self.history << 3
         )
 
 
+_ACCOUNT_FLAGS = _flags_table(AccountFlags)
+_ACCOUNT_FLAGS_DEFAULT = AccountFlags().to_uint16()
+
+
 @dataclass(slots=True, frozen=True)
 class TransferFlags:
     """See [TransferFlags](https://docs.tigerbeetle.com/reference/transfer#flags)"""
@@ -48,16 +76,20 @@ class TransferFlags:
 
     def to_uint16(self) -> uint.UInt16:
         """Convert to a `UInt16`."""
-        return uint.UInt16(
-            (self.linked << 0)
-            | (self.pending << 1)
-            | (self.post_pending_transfer << 2)
-            | (self.void_pending_transfer << 3)
-            | (self.balancing_debit << 4)
-            | (self.balancing_credit << 5)
+        return uint.UInt16._from_int(
+            self.linked
+            | self.pending << 1
+            | self.post_pending_transfer << 2
+            | self.void_pending_transfer << 3
+            | self.balancing_debit << 4
+            | self.balancing_credit << 5
         )
 
 
+_TRANSFER_FLAGS = _flags_table(TransferFlags)
+_TRANSFER_FLAGS_DEFAULT = TransferFlags().to_uint16()
+
+
 @dataclass(slots=True, frozen=True)
 class AccountFilterFlags:
     """See [AccountFilterFlags](https://docs.tigerbeetle.com/reference/account-filter#flags)"""
@@ -71,14 +103,27 @@ class AccountFilterFlags:
 
     def to_uint32(self) -> uint.UInt32:
         """Convert to a `UInt32`."""
-        return uint.UInt32(
-            (self.debits << 0) | (self.credits << 1) | (self.reversed << 2)
+        return uint.UInt32._from_int(
+            self.debits | self.credits << 1 | self.reversed << 2
         )
 
 
-@dataclass(slots=True, frozen=True)
+_ACCOUNT_FILTER_FLAGS = _flags_table(AccountFilterFlags)
+_ACCOUNT_FILTER_FLAGS_DEFAULT = AccountFilterFlags().to_uint32()
+_ACCOUNT_FILTER_LIMIT_DEFAULT = uint.UInt32(8190)
+
+
+# Records are decoded in bulk, and a frozen dataclass `__init__` sets every
+# field through `object.__setattr__`, which is several times slower. So
+# immutability is documented rather than enforced: they stay hashable by
+# value, and must not be changed while used as a set member or dict key.
+@dataclass(slots=True, unsafe_hash=True)
 class Account:
-    """See [Account](https://docs.tigerbeetle.com/reference/account/#)"""
+    """See [Account](https://docs.tigerbeetle.com/reference/account/#)
+
+    Hashable by value, so fields must not be reassigned while the instance is
+    in a set or used as a dict key.
+    """
 
     id: uint.UInt128
     """See [id](https://docs.tigerbeetle.com/reference/account/#id)"""
@@ -86,40 +131,39 @@ class Account:
     """See [ledger](https://docs.tigerbeetle.com/reference/account/#ledger)"""
     code: uint.UInt16
     """See [code](https://docs.tigerbeetle.com/reference/account/#code)"""
-    debits_pending: uint.UInt128 = uint.UInt128(0)
+    debits_pending: uint.UInt128 = _UINT128_ZERO
     """See [debits_pending](https://docs.tigerbeetle.com/reference/account/#debits_pending)"""
-    debits_posted: uint.UInt128 = uint.UInt128(0)
+    debits_posted: uint.UInt128 = _UINT128_ZERO
     """See [debits_posted](https://docs.tigerbeetle.com/reference/account/#debits_posted)"""
-    credits_pending: uint.UInt128 = uint.UInt128(0)
+    credits_pending: uint.UInt128 = _UINT128_ZERO
     """See [credits_pending](https://docs.tigerbeetle.com/reference/account/#credits_pending)"""
-    credits_posted: uint.UInt128 = uint.UInt128(0)
+    credits_posted: uint.UInt128 = _UINT128_ZERO
     """See [credits_posted](https://docs.tigerbeetle.com/reference/account/#credits_posted)"""
-    user_data_128: uint.UInt128 = uint.UInt128(0)
+    user_data_128: uint.UInt128 = _UINT128_ZERO
     """See [user_data_128](https://docs.tigerbeetle.com/reference/account/#user_data_128)"""
-    user_data_64: uint.UInt64 = uint.UInt64(0)
+    user_data_64: uint.UInt64 = _UINT64_ZERO
     """See [user_data_64](https://docs.tigerbeetle.com/reference/account/#user_data_64)"""
-    user_data_32: uint.UInt32 = uint.UInt32(0)
+    user_data_32: uint.UInt32 = _UINT32_ZERO
     """See [user_data_32](https://docs.tigerbeetle.com/reference/account/#user_data_32)"""
-    flags: uint.UInt16 = AccountFlags().to_uint16()
+    flags: uint.UInt16 = _ACCOUNT_FLAGS_DEFAULT
     """See [flags](https://docs.tigerbeetle.com/reference/account/#flags)"""
-    timestamp: uint.UInt64 = uint.UInt64(0)
+    timestamp: uint.UInt64 = _UINT64_ZERO
     """See [timestamp](https://docs.tigerbeetle.com/reference/account/#timestamp)"""
     reserved: int = 0
     """See [reserved](https://docs.tigerbeetle.com/reference/account/#reserved)"""
 
     def get_flags(self) -> AccountFlags:
         """Get the account flags."""
-        return AccountFlags(
-            linked=bool((self.flags >> 0) & 0x1),
-            debits_must_not_exceed_credits=bool((self.flags >> 1) & 0x1),
-            credits_must_not_exceed_debits=bool((self.flags >> 2) & 0x1),
-            history=bool((self.flags >> 3) & 0x1),
-        )
+        return _ACCOUNT_FLAGS[self.flags.int & 0xF]
 
 
-@dataclass(slots=True, frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class Transfer:
-    """See [Transfer](https://docs.tigerbeetle.com/reference/transfer/#)"""
+    """See [Transfer](https://docs.tigerbeetle.com/reference/transfer/#)
+
+    Hashable by value, so fields must not be reassigned while the instance is
+    in a set or used as a dict key.
+    """
 
     id: uint.UInt128
     """See [id](https://docs.tigerbeetle.com/reference/transfer/#id)"""
@@ -133,31 +177,24 @@ class Transfer:
     """See [ledger](https://docs.tigerbeetle.com/reference/transfer/#ledger)"""
     code: uint.UInt16
     """See [code](https://docs.tigerbeetle.com/reference/transfer/#code)"""
-    pending_id: uint.UInt128 = uint.UInt128(0)
+    pending_id: uint.UInt128 = _UINT128_ZERO
     """See [pending_id](https://docs.tigerbeetle.com/reference/transfer/#pending_id)"""
-    user_data_128: uint.UInt128 = uint.UInt128(0)
+    user_data_128: uint.UInt128 = _UINT128_ZERO
     """See [user_data_128](https://docs.tigerbeetle.com/reference/transfer/#user_data_128)"""
-    user_data_64: uint.UInt64 = uint.UInt64(0)
+    user_data_64: uint.UInt64 = _UINT64_ZERO
     """See [user_data_64](https://docs.tigerbeetle.com/reference/transfer/#user_data_64)"""
-    user_data_32: uint.UInt32 = uint.UInt32(0)
+    user_data_32: uint.UInt32 = _UINT32_ZERO
     """See [user_data_32](https://docs.tigerbeetle.com/reference/transfer/#user_data_32)"""
-    timeout: uint.UInt32 = uint.UInt32(0)
+    timeout: uint.UInt32 = _UINT32_ZERO
     """See [timeout](https://docs.tigerbeetle.com/reference/transfer/#timeout)"""
-    flags: uint.UInt16 = TransferFlags().to_uint16()
+    flags: uint.UInt16 = _TRANSFER_FLAGS_DEFAULT
     """See [flags](https://docs.tigerbeetle.com/reference/transfer/#flags)"""
-    timestamp: uint.UInt64 = uint.UInt64(0)
+    timestamp: uint.UInt64 = _UINT64_ZERO
     """See [timestamp](https://docs.tigerbeetle.com/reference/transfer/#timestamp)"""
 
     def get_flags(self) -> TransferFlags:
         """Get the transfer flags."""
-        return TransferFlags(
-            linked=bool((self.flags >> 0) & 0x1),
-            pending=bool((self.flags >> 1) & 0x1),
-            post_pending_transfer=bool((self.flags >> 2) & 0x1),
-            void_pending_transfer=bool((self.flags >> 3) & 0x1),
-            balancing_debit=bool((self.flags >> 4) & 0x1),
-            balancing_credit=bool((self.flags >> 5) & 0x1),
-        )
+        return _TRANSFER_FLAGS[self.flags.int & 0x3F]
 
 
 class CreateAccountResult(enum.IntEnum):
@@ -209,6 +246,13 @@ class CreateAccountResult(enum.IntEnum):
     """See [exists](https://docs.tigerbeetle.com/reference/requests/create_accounts#exists)"""
 
 
+# The result codes are dense, so decoding is a tuple index instead of an enum
+# lookup.
+_CREATE_ACCOUNT_RESULTS = tuple(
+    map(CreateAccountResult, range(len(CreateAccountResult)))
+)
+
+
 class CreateTransferResult(enum.IntEnum):
     """See [CreateTransferResult](https://docs.tigerbeetle.com/reference/requests/create_transfers#)"""
 
@@ -326,17 +370,30 @@ class CreateTransferResult(enum.IntEnum):
     """See [exceeds_debits](https://docs.tigerbeetle.com/reference/requests/create_transfers#exceeds_debits)"""
 
 
-@dataclass(slots=True, frozen=True)
+_CREATE_TRANSFER_RESULTS = tuple(
+    map(CreateTransferResult, range(len(CreateTransferResult)))
+)
+
+
+@dataclass(slots=True, unsafe_hash=True)
 class CreateAccountsResult:
-    """Create accounts result."""
+    """Create accounts result.
+
+    Hashable by value, so fields must not be reassigned while the instance is
+    in a set or used as a dict key.
+    """
 
     index: int
     result: CreateAccountResult
 
 
-@dataclass(slots=True, frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class CreateTransfersResult:
-    """Create transfers result."""
+    """Create transfers result.
+
+    Hashable by value, so fields must not be reassigned while the instance is
+    in a set or used as a dict key.
+    """
 
     index: int
     result: CreateTransferResult
@@ -348,27 +405,27 @@ class AccountFilter:
 
     account_id: uint.UInt128
     """See [account_id](https://docs.tigerbeetle.com/reference/account-filter#account_id)"""
-    timestamp_min: uint.UInt64 = uint.UInt64(0)
+    timestamp_min: uint.UInt64 = _UINT64_ZERO
     """See [timestamp_min](https://docs.tigerbeetle.com/reference/account-filter#timestamp_min)"""
-    timestamp_max: uint.UInt64 = uint.UInt64(0)
+    timestamp_max: uint.UInt64 = _UINT64_ZERO
     """See [timestamp_max](https://docs.tigerbeetle.com/reference/account-filter#timestamp_max)"""
-    limit: uint.UInt32 = uint.UInt32(8190)
+    limit: uint.UInt32 = _ACCOUNT_FILTER_LIMIT_DEFAULT
     """See [limit](https://docs.tigerbeetle.com/reference/account-filter#limit)"""
-    flags: uint.UInt32 = AccountFilterFlags().to_uint32()
+    flags: uint.UInt32 = _ACCOUNT_FILTER_FLAGS_DEFAULT
     """See [flags](https://docs.tigerbeetle.com/reference/account-filter#flags)"""
 
     def get_flags(self) -> AccountFilterFlags:
         """Get the account filter flags."""
-        return AccountFilterFlags(
-            debits=bool((self.flags >> 0) & 0x1),
-            credits=bool((self.flags >> 1) & 0x1),
-            reversed=bool((self.flags >> 2) & 0x1),
-        )
+        return _ACCOUNT_FILTER_FLAGS[self.flags.int & 0x7]
 
 
-@dataclass(slots=True, frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class AccountBalance:
-    """See [AccountBalance](https://docs.tigerbeetle.com/reference/account-balances#)"""
+    """See [AccountBalance](https://docs.tigerbeetle.com/reference/account-balances#)
+
+    Hashable by value, so fields must not be reassigned while the instance is
+    in a set or used as a dict key.
+    """
 
     debits_pending: uint.UInt128
     """See [debits_pending](https://docs.tigerbeetle.com/reference/account-balances#debits_pending)"""
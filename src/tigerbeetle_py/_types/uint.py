@@ -1,6 +1,10 @@
 """Unsigned integer."""
 
+from operator import index as _index
+
 Buffer = bytes | bytearray | memoryview
+# The same types as a tuple, which `isinstance` checks faster than a union.
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
 
 
 def _int_to_bytes(n: int, length: int) -> bytes:
@@ -11,25 +15,52 @@ def _bytes_to_int(b: Buffer) -> int:
     return int.from_bytes(b, "little")
 
 
+def _coerce(other: object) -> int | None:
+    """Get the value of an operand, or `None` if its type isn't supported."""
+    if isinstance(other, UInt):
+        return other._int
+    if isinstance(other, int):
+        return other
+    if isinstance(other, _BUFFER_TYPES):
+        return _bytes_to_int(other)
+    if isinstance(other, str):
+        return int(other)
+    return None
+
+
 class UInt:
     """Unsigned integer."""
 
-    __slots__ = ("memory", "n_bits")
+    # The value is stored as a plain `int`, which every operator works on; the
+    # little-endian bytes are only built when asked for.
+    __slots__ = ("_int", "n_bits")
 
     n_bits: int
+    n_bytes: int
+    max_value: int
+    _half_bits: int
+    _half_mask: int
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        # Derived once per width, so the accessors don't recompute them.
+        cls.n_bytes = cls.n_bits // 8
+        cls.max_value = (1 << cls.n_bits) - 1
+        cls._half_bits = cls.n_bits // 2
+        cls._half_mask = (1 << cls._half_bits) - 1
 
     def __init__(self, integer: int) -> None:
-        if not isinstance(integer, int):
-            raise TypeError("integer must be an integer")
+        # Accepts anything integer-like, raising `TypeError` for the rest.
+        integer = _index(integer)
         if integer < 0:
             raise ValueError("integer must be non-negative")
-        if integer.bit_length() > self.n_bits:
+        if integer > self.max_value:
             msg = f"integer must be less than 2**{self.n_bits}"
             raise ValueError(msg)
-        self.memory = memoryview(_int_to_bytes(integer, self.n_bytes))
+        self._int = integer
 
     def __hash__(self) -> int:
-        return hash(self.memory)
+        return hash(self._int)
 
     def __bytes__(self) -> bytes:
         return self.bytes
@@ -50,224 +81,137 @@ class UInt:
         return self.str
 
     def __add__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int + other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int + _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int + other)
-        if isinstance(other, str):
-            return self.__class__(self.int + int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int + value)
 
     def __radd__(self, other: object) -> "UInt":
         return self.__add__(other)
 
     def __iadd__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            self.memory = _int_to_bytes(self.int + other.int, self.n_bytes)
-        elif isinstance(other, (bytes, memoryview)):
-            self.memory = _int_to_bytes(self.int + _bytes_to_int(other), self.n_bytes)
-        elif isinstance(other, int):
-            self.memory = _int_to_bytes(self.int + other, self.n_bytes)
-        elif isinstance(other, str):
-            self.memory = _int_to_bytes(self.int + int(other), self.n_bytes)
-        else:
+        value = _coerce(other)
+        if value is None:
             return NotImplemented
-        return self
+        integer = self._int + value
+        if integer < 0 or integer > self.max_value:
+            msg = f"integer must be in range for {self.__class__.__name__}"
+            raise OverflowError(msg)
+        # A new instance, so that aliases such as shared field defaults are
+        # left unchanged.
+        return self.__class__._from_int(integer)
 
     def __sub__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int - other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int - _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int - other)
-        if isinstance(other, str):
-            return self.__class__(self.int - int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int - value)
 
     def __mul__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int * other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int * _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int * other)
-        if isinstance(other, str):
-            return self.__class__(self.int * int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int * value)
 
     def __divmod__(self, other: object) -> tuple["UInt", "UInt"]:
-        if isinstance(other, UInt):
-            return self.__class__(self.int // other.int), self.__class__(
-                self.int % other.int
-            )
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int // _bytes_to_int(other)), self.__class__(
-                self.int % _bytes_to_int(other)
-            )
-        if isinstance(other, int):
-            return self.__class__(self.int // other), self.__class__(self.int % other)
-        if isinstance(other, str):
-            return self.__class__(self.int // int(other)), self.__class__(
-                self.int % int(other)
-            )
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int // value), self.__class__(self._int % value)
 
     def __floordiv__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int // other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int // _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int // other)
-        if isinstance(other, str):
-            return self.__class__(self.int // int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int // value)
 
     def __mod__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int % other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int % _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int % other)
-        if isinstance(other, str):
-            return self.__class__(self.int % int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int % value)
 
     def __pow__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int**other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int ** _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int**other)
-        if isinstance(other, str):
-            return self.__class__(self.int ** int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int**value)
 
     def __lshift__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int << other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int << _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int << other)
-        if isinstance(other, str):
-            return self.__class__(self.int << int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int << value)
 
     def __rshift__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int >> other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int >> _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int >> other)
-        if isinstance(other, str):
-            return self.__class__(self.int >> int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int >> value)
 
     def __and__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int & other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int & _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int & other)
-        if isinstance(other, str):
-            return self.__class__(self.int & int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int & value)
 
     def __or__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int | other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int | _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int | other)
-        if isinstance(other, str):
-            return self.__class__(self.int | int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int | value)
 
     def __xor__(self, other: object) -> "UInt":
-        if isinstance(other, UInt):
-            return self.__class__(self.int ^ other.int)
-        if isinstance(other, (bytes, memoryview)):
-            return self.__class__(self.int ^ _bytes_to_int(other))
-        if isinstance(other, int):
-            return self.__class__(self.int ^ other)
-        if isinstance(other, str):
-            return self.__class__(self.int ^ int(other))
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self.__class__(self._int ^ value)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, UInt):
-            return self.memory == other.memory
-        if isinstance(other, (bytes, memoryview)):
-            return self.memory == other
+            return self._int == other._int and self.n_bits == other.n_bits
+        if isinstance(other, _BUFFER_TYPES):
+            return self.bytes == other
         if isinstance(other, int):
-            return self.int == other
+            return self._int == other
         if isinstance(other, str):
             return self.str == other
         return NotImplemented
 
     def __ne__(self, other: object) -> bool:
         if isinstance(other, UInt):
-            return self.memory != other.memory
-        if isinstance(other, (bytes, memoryview)):
-            return self.memory != other
+            return self._int != other._int or self.n_bits != other.n_bits
+        if isinstance(other, _BUFFER_TYPES):
+            return self.bytes != other
         if isinstance(other, int):
-            return self.int != other
+            return self._int != other
         if isinstance(other, str):
             return self.str != other
         return NotImplemented
 
     def __lt__(self, other: object) -> bool:
-        if isinstance(other, UInt):
-            return self.int < other.int
-        if isinstance(other, (bytes, memoryview)):
-            return self.int < _bytes_to_int(other)
-        if isinstance(other, int):
-            return self.int < other
-        if isinstance(other, str):
-            return self.int < int(other)
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._int < value
 
     def __gt__(self, other: object) -> bool:
-        if isinstance(other, UInt):
-            return self.int > other.int
-        if isinstance(other, (bytes, memoryview)):
-            return self.int > _bytes_to_int(other)
-        if isinstance(other, int):
-            return self.int > other
-        if isinstance(other, str):
-            return self.int > int(other)
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._int > value
 
     def __le__(self, other: object) -> bool:
-        if isinstance(other, UInt):
-            return self.int <= other.int
-        if isinstance(other, (bytes, memoryview)):
-            return self.int <= _bytes_to_int(other)
-        if isinstance(other, int):
-            return self.int <= other
-        if isinstance(other, str):
-            return self.int <= int(other)
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._int <= value
 
     def __ge__(self, other: object) -> bool:
-        if isinstance(other, UInt):
-            return self.int >= other.int
-        if isinstance(other, (bytes, memoryview)):
-            return self.int >= _bytes_to_int(other)
-        if isinstance(other, int):
-            return self.int >= other
-        if isinstance(other, str):
-            return self.int >= int(other)
-        return NotImplemented
+        value = _coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._int >= value
 
     def __tuple__(self) -> tuple[int, int]:
         return self.tuple
@@ -275,26 +219,25 @@ class UInt:
     def __bool__(self) -> bool:
         return bool(self.int)
 
-    @classmethod
-    @property
-    def n_bytes(cls) -> int:
-        return cls.n_bits // 8
-
     @property
     def high(self) -> int:
-        return _bytes_to_int(self.memory[self.n_bytes // 2 :])
+        return self._int >> self._half_bits
 
     @property
     def low(self) -> int:
-        return _bytes_to_int(self.memory[: self.n_bytes // 2])
+        return self._int & self._half_mask
 
     @property
     def int(self) -> int:
-        return _bytes_to_int(self.memory)
+        return self._int
+
+    @property
+    def memory(self) -> memoryview:
+        return memoryview(self.bytes)
 
     @property
     def bytes(self) -> bytes:
-        return bytes(self.memory)
+        return _int_to_bytes(self._int, self.n_bytes)
 
     @property
     def hex(self) -> str:
@@ -310,34 +253,64 @@ class UInt:
 
     @property
     def tuple(self) -> tuple[int, int]:
-        return self.high, self.low
+        # Every 128-bit field goes through here when a batch is packed.
+        integer = self._int
+        return integer >> self._half_bits, integer & self._half_mask
 
     @classmethod
     def from_bytes(cls, b: Buffer) -> "UInt":
-        if not isinstance(b, Buffer):
-            raise TypeError("b must be bytes, bytearray or memoryview")
-        if len(b) != cls.n_bytes:
-            msg = f"b must be {cls.n_bytes} bytes, got {len(b)}"
+        if isinstance(b, (bytes, bytearray)):
+            n_bytes = len(b)
+        else:
+            # Any other buffer, e.g. an `array.array`, is read in place through
+            # a memoryview, whose `len` counts items, not bytes.
+            try:
+                b = memoryview(b)
+            except TypeError:
+                raise TypeError("b must support the buffer protocol") from None
+            n_bytes = b.nbytes
+        if n_bytes != cls.n_bytes:
+            msg = f"b must be {cls.n_bytes} bytes, got {n_bytes}"
             raise ValueError(msg)
-        return cls(_bytes_to_int(b))
+        # `n_bytes` bytes always hold a value in range.
+        return cls._from_int(_bytes_to_int(b))
 
     @classmethod
     def from_tuple(cls, high: int, low: int) -> "UInt":
-        if not isinstance(high, int):
-            raise TypeError("high must be an integer")
-        if not isinstance(low, int):
-            raise TypeError("low must be an integer")
+        high = _index(high)
+        low = _index(low)
         if high < 0:
             raise ValueError("high must be non-negative")
         if low < 0:
             raise ValueError("low must be non-negative")
-        if high.bit_length() > cls.n_bits // 2:
-            msg = f"high must be less than 2**{cls.n_bits // 2}"
+        if high.bit_length() > cls._half_bits:
+            msg = f"high must be less than 2**{cls._half_bits}"
             raise ValueError(msg)
-        if low.bit_length() > cls.n_bits // 2:
-            msg = f"low must be less than 2**{cls.n_bits // 2}"
+        if low.bit_length() > cls._half_bits:
+            msg = f"low must be less than 2**{cls._half_bits}"
             raise ValueError(msg)
-        return cls((high << cls.n_bits // 2) | low)
+        return cls((high << cls._half_bits) | low)
+
+    @classmethod
+    def _from_int(cls, integer: int) -> "UInt":
+        """Build from an integer that is already known to be in range.
+
+        Skips the checks of `__init__` for values the library computes itself.
+        """
+        self = object.__new__(cls)
+        self._int = integer
+        return self
+
+    @classmethod
+    def _from_hl(cls, high: int, low: int) -> "UInt":
+        """Build from two halves that are already known to be in range.
+
+        Used by the decoders, whose values come straight out of a `struct`
+        unpack, so the checks of `from_tuple` and `__init__` are skipped.
+        """
+        self = object.__new__(cls)
+        self._int = (high << cls._half_bits) | low
+        return self
 
 
 class UInt128(UInt):
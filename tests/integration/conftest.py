@@ -5,7 +5,7 @@ from collections.abc import Iterable
 from pathlib import Path
 
 import pytest
-from tigerbeetle_py import Client, uint
+from tigerbeetle_py import Client, bindings, uid, uint
 
 
 @pytest.fixture(scope="session")
@@ -86,30 +86,24 @@ def _tigerbeetle(
     address_arg = f"--address={port}"
     cache_size_arg = "--cache-grid=256MiB"
     cmd = [tigerbeetle_cmd, "start", address_arg, cache_size_arg, db_file.as_posix()]
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # The output is never read, so it must not go to a pipe that could fill up
+    # and block the server.
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     print("TigerBeetle started")
     yield
     print("TigerBeetle stopping")
     proc.terminate()
     # this removes the zombie process
-    proc.poll()
-
-
-# @pytest.fixture(scope="session")
-# def tb_client(
-#     _tigerbeetle: None,
-#     port: int,
-#     cluster_id: uint.UInt128,
-#     concurrency_max: int,
-# ) -> Iterable[Client]:
-#     """Return the default TigerBeetle client."""
-#     client = Client(cluster_id, [str(port)], concurrency_max)
-#     yield client
-#     client.close()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
 
 
 @pytest.fixture(scope="session")
 def tb_client(
+    _tigerbeetle: None,
     cluster_id: uint.UInt128,
     port: int,
     concurrency_max: int,
@@ -118,3 +112,18 @@ def tb_client(
     client = Client(cluster_id, [str(port)], concurrency_max)
     yield client
     client.close()
+
+
+@pytest.fixture(scope="module")
+def prepared_accounts(tb_client: Client) -> tuple[uint.UInt128, uint.UInt128]:
+    """Create two accounts once per module for tests that only read them."""
+    account_a_id = uid.ID()
+    account_b_id = uid.ID()
+    results = tb_client.create_accounts(
+        [
+            bindings.Account(account_a_id, ledger=uint.UInt32(1), code=uint.UInt16(1)),
+            bindings.Account(account_b_id, ledger=uint.UInt32(1), code=uint.UInt16(2)),
+        ]
+    )
+    assert all(result.result == 0 for result in results)
+    return account_a_id, account_b_id
@@ -1,16 +1,25 @@
 """Test the client."""
 
+import asyncio
 import concurrent.futures
+import struct
 
 import pytest
 
-from tigerbeetle_py import Client, bindings, uint, uid
+from tigerbeetle_py import Client, bindings, errors, uint, uid
 
 uint128 = uint.UInt128
 uint64 = uint.UInt64
 uint32 = uint.UInt32
 uint16 = uint.UInt16
 
+# Shared values for the fields every test sets the same way.
+LEDGER_1 = uint32(1)
+CODE_1 = uint16(1)
+CODE_2 = uint16(2)
+AMOUNT_1 = uint64(1)
+AMOUNT_100 = uint64(100)
+
 
 @pytest.fixture(name="account_a_id")
 def account_a_id_ifx() -> uint128:
@@ -47,8 +56,8 @@ def test_create_accounts(
     account_b_id: uint128,
 ) -> None:
     """Test creating accounts."""
-    account_a = bindings.Account(account_a_id, ledger=uint32(1), code=uint16(1))
-    account_b = bindings.Account(account_b_id, ledger=uint32(1), code=uint16(2))
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
 
     results = tb_client.create_accounts([account_a, account_b])
 
@@ -57,15 +66,10 @@ def test_create_accounts(
 
 def test_lookup_accounts(
     tb_client: Client,
-    account_a_id: uint128,
-    account_b_id: uint128,
+    prepared_accounts: tuple[uint128, uint128],
 ) -> None:
     """Test looking up accounts."""
-    account_a = bindings.Account(uint128(0xC), ledger=uint32(1), code=uint16(1))
-    account_b = bindings.Account(uint128(0xD), ledger=uint32(1), code=uint16(2))
-    tb_client.create_accounts([account_a, account_b])
-
-    accounts = tb_client.lookup_accounts([uint128(0xC), uint128(0xD)])
+    accounts = tb_client.lookup_accounts(list(prepared_accounts))
 
     assert len(accounts) == 2
 
@@ -92,6 +96,17 @@ def test_lookup_accounts(
     # assert sys.getsizeof(acc_b) == 128
 
 
+def test_lookup_accounts_from_buffer(
+    tb_client: Client,
+    prepared_accounts: tuple[uint128, uint128],
+) -> None:
+    """Test looking up accounts from a buffer of packed ids."""
+    ids = b"".join(struct.pack("<QQ", *id_.tuple) for id_ in prepared_accounts)
+    accounts = tb_client.lookup_accounts(ids)
+
+    assert [account.id for account in accounts] == list(prepared_accounts)
+
+
 def test_create_transfers(
     tb_client: Client,
     account_a_id: uint128,
@@ -100,25 +115,25 @@ def test_create_transfers(
     transfer_b_id: uint128,
 ) -> None:
     """Test creating transfers."""
-    account_a = bindings.Account(account_a_id, ledger=uint32(1), code=uint16(1))
-    account_b = bindings.Account(account_b_id, ledger=uint32(1), code=uint16(2))
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
     tb_client.create_accounts([account_a, account_b])
 
     transfer_a = bindings.Transfer(
         transfer_a_id,
         debit_account_id=account_a_id,
         credit_account_id=account_b_id,
-        amount=uint64(100),
-        ledger=uint32(1),
-        code=uint16(1),
+        amount=AMOUNT_100,
+        ledger=LEDGER_1,
+        code=CODE_1,
     )
     transfer_b = bindings.Transfer(
         transfer_b_id,
         debit_account_id=account_b_id,
         credit_account_id=account_a_id,
         amount=uint64(50),
-        ledger=uint32(1),
-        code=uint16(1),
+        ledger=LEDGER_1,
+        code=CODE_1,
     )
 
     results = tb_client.create_transfers([transfer_a, transfer_b])
@@ -140,33 +155,67 @@ def test_create_transfers(
     assert account_b.credits_posted == 100
 
 
-def test_create_linked_transfers(
+# 8189 transfers of 128 bytes still fit in one request of the default 1 MiB
+# message size.
+@pytest.mark.parametrize("batch_size", [1, 8, 64, 512, 8189])
+def test_create_transfers_batch_size(
     tb_client: Client,
     account_a_id: uint128,
     account_b_id: uint128,
+    batch_size: int,
+) -> None:
+    """Test creating a batch of transfers in a single request."""
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
+    tb_client.create_accounts([account_a, account_b])
+
+    transfers = [
+        bindings.Transfer(
+            uid.ID(),
+            debit_account_id=account_a_id,
+            credit_account_id=account_b_id,
+            amount=AMOUNT_1,
+            ledger=LEDGER_1,
+            code=CODE_1,
+        )
+        for _ in range(batch_size)
+    ]
+
+    results = tb_client.create_transfers(transfers)
+
+    assert len(results) == batch_size
+    assert all(result.result == 0 for result in results)
+
+    accounts = tb_client.lookup_accounts([account_a_id, account_b_id])
+    assert accounts[0].debits_posted == batch_size
+    assert accounts[1].credits_posted == batch_size
+
+
+def test_create_linked_transfers(
+    tb_client: Client,
+    prepared_accounts: tuple[uint128, uint128],
     transfer_a_id: uint128,
 ) -> None:
     """Test creating linked transfers."""
-    account_a = bindings.Account(account_a_id, ledger=uint32(1), code=uint16(1))
-    account_b = bindings.Account(account_b_id, ledger=uint32(1), code=uint16(2))
-    tb_client.create_accounts([account_a, account_b])
+    # Both transfers fail, so the shared accounts are left untouched.
+    account_a_id, account_b_id = prepared_accounts
 
     transfer_a = bindings.Transfer(
         transfer_a_id,
         debit_account_id=account_a_id,
         credit_account_id=account_b_id,
-        amount=uint64(100),
-        ledger=uint32(1),
-        code=uint16(1),
+        amount=AMOUNT_100,
+        ledger=LEDGER_1,
+        code=CODE_1,
         flags=bindings.AccountFlags(linked=True).to_uint16(),
     )
     transfer_b = bindings.Transfer(
         transfer_a_id,
         debit_account_id=account_a_id,
         credit_account_id=account_b_id,
-        amount=uint64(100),
-        ledger=uint32(1),
-        code=uint16(1),
+        amount=AMOUNT_100,
+        ledger=LEDGER_1,
+        code=CODE_1,
     )
 
     results = tb_client.create_transfers([transfer_a, transfer_b])
@@ -208,41 +257,162 @@ def test_create_concurrent_transfers(
     """Test creating concurrent transfers."""
     # TODO: 1_000_000 don't complete
     transfers_max = 1_000
-    account_a = bindings.Account(account_a_id, ledger=uint32(1), code=uint16(1))
-    account_b = bindings.Account(account_b_id, ledger=uint32(1), code=uint16(2))
-    tb_client.create_accounts([account_a, account_b])
+    # Each request carries a batch, as real clients would, while still keeping
+    # many requests in flight at once.
+    batch_size = 10
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
+    results = tb_client.create_accounts([account_a, account_b])
+    assert all(result.result == 0 for result in results)
+
+    def create_transfers_batch(transfer_ids: list[uint128]) -> None:
+        transfers = [
+            bindings.Transfer(
+                transfer_id,
+                debit_account_id=account_a_id,
+                credit_account_id=account_b_id,
+                amount=AMOUNT_1,
+                ledger=LEDGER_1,
+                code=CODE_1,
+            )
+            for transfer_id in transfer_ids
+        ]
+        results = tb_client.create_transfers(transfers)
+        assert len(results) == len(transfer_ids)
+        assert all(result.result == 0 for result in results)
+
+    # The IDs are generated up front so the workers only measure submission.
+    transfer_ids = [uid.ID() for _ in range(transfers_max)]
+    batches = [
+        transfer_ids[i : i + batch_size] for i in range(0, transfers_max, batch_size)
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency_max) as executor:
+        # Consuming the results re-raises any failed batch.
+        list(executor.map(create_transfers_batch, batches))
 
     accounts = tb_client.lookup_accounts([account_a_id, account_b_id])
     assert len(accounts) == 2
 
-    account_a_debits = accounts[0].debits_posted
-    account_b_credits = accounts[1].credits_posted
+    # The accounts were just created, so their balances started at zero.
+    assert accounts[0].debits_posted == transfers_max
+    assert accounts[1].credits_posted == transfers_max
 
-    def create_transfer():
-        transfer = bindings.Transfer(
-            uid.ID(),
-            debit_account_id=account_a_id,
-            credit_account_id=account_b_id,
-            amount=uint64(1),
-            ledger=uint32(1),
-            code=uint16(1),
-        )
-        results = tb_client.create_transfers([transfer])
-        assert results[0].result == 0
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency_max) as executor:
-        futures = [executor.submit(create_transfer) for _ in range(transfers_max)]
-        for future in concurrent.futures.as_completed(futures):
-            future.result()
+def test_create_transfers_many(
+    tb_client: Client,
+    account_a_id: uint128,
+    account_b_id: uint128,
+    concurrency_max: int,
+) -> None:
+    """Test creating more batches of transfers than there are packets."""
+    batches_max = concurrency_max * 2
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
+    tb_client.create_accounts([account_a, account_b])
+
+    batches = [
+        [
+            bindings.Transfer(
+                uid.ID(),
+                debit_account_id=account_a_id,
+                credit_account_id=account_b_id,
+                amount=AMOUNT_1,
+                ledger=LEDGER_1,
+                code=CODE_1,
+            )
+            for _ in range(2)
+        ]
+        for _ in range(batches_max)
+    ]
+
+    results = tb_client.create_transfers_many(batches)
+
+    assert len(results) == batches_max
+    assert all(r.result == 0 for batch in results for r in batch)
 
     accounts = tb_client.lookup_accounts([account_a_id, account_b_id])
+    assert accounts[0].debits_posted == batches_max * 2
+    assert accounts[1].credits_posted == batches_max * 2
+
+
+def test_create_accounts_many_empty_batch(
+    tb_client: Client,
+    account_a_id: uint128,
+) -> None:
+    """Test that an empty batch fails the call before any batch is submitted."""
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+
+    with pytest.raises(errors.EmptyBatchError):
+        tb_client.create_accounts_many([[account_a], []])
+
+    assert tb_client.lookup_accounts([account_a_id]) == []
+
+
+def test_create_concurrent_transfers_async(
+    tb_client: Client,
+    account_a_id: uint128,
+    account_b_id: uint128,
+    concurrency_max: int,
+) -> None:
+    """Test creating concurrent transfers from an event loop."""
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
+
+    async def run() -> list[bindings.Account]:
+        await tb_client.create_accounts_async([account_a, account_b])
+        transfers = [
+            bindings.Transfer(
+                uid.ID(),
+                debit_account_id=account_a_id,
+                credit_account_id=account_b_id,
+                amount=AMOUNT_1,
+                ledger=LEDGER_1,
+                code=CODE_1,
+            )
+            for _ in range(concurrency_max)
+        ]
+        results = await asyncio.gather(
+            *(tb_client.create_transfers_async([t]) for t in transfers)
+        )
+        assert all(r[0].result == 0 for r in results)
+        return await tb_client.lookup_accounts_async([account_a_id, account_b_id])
+
+    accounts = asyncio.run(run())
+
     assert len(accounts) == 2
+    assert accounts[0].debits_posted == concurrency_max
+    assert accounts[1].credits_posted == concurrency_max
+
+
+def test_create_accounts_async_cancelled_twice(
+    tb_client: Client,
+    account_a_id: uint128,
+) -> None:
+    """Test that a request cancelled twice still waits for its reply."""
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    loop_errors = []
+
+    async def run() -> list[bindings.Account]:
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: loop_errors.append(context))
+
+        task = asyncio.create_task(tb_client.create_accounts_async([account_a]))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The reply was awaited before the packet was released, so the client
+        # keeps working and the late completion doesn't fail on the loop.
+        return await tb_client.lookup_accounts_async([account_a_id])
 
-    account_a_debits_after = accounts[0].debits_posted
-    account_b_credits_after = accounts[1].credits_posted
+    accounts = asyncio.run(run())
 
-    assert account_a_debits_after == account_a_debits + transfers_max
-    assert account_b_credits_after == account_b_credits + transfers_max
+    assert [account.id for account in accounts] == [account_a_id]
+    assert loop_errors == []
 
 
 def test_get_account_balances(
@@ -254,20 +424,20 @@ def test_get_account_balances(
     """Test getting account balances."""
     account_a = bindings.Account(
         account_a_id,
-        ledger=uint32(1),
-        code=uint16(1),
+        ledger=LEDGER_1,
+        code=CODE_1,
         flags=bindings.AccountFlags(history=True).to_uint16(),
     )
-    account_b = bindings.Account(account_b_id, ledger=uint32(1), code=uint16(2))
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
     tb_client.create_accounts([account_a, account_b])
 
     transfer_a = bindings.Transfer(
         transfer_a_id,
         debit_account_id=account_a_id,
         credit_account_id=account_b_id,
-        amount=uint64(100),
-        ledger=uint32(1),
-        code=uint16(1),
+        amount=AMOUNT_100,
+        ledger=LEDGER_1,
+        code=CODE_1,
     )
     tb_client.create_transfers([transfer_a])
 
@@ -294,25 +464,25 @@ def test_get_account_transfers(
     transfer_b_id: uint128,
 ) -> None:
     """Test getting account transfers."""
-    account_a = bindings.Account(account_a_id, ledger=uint32(1), code=uint16(1))
-    account_b = bindings.Account(account_b_id, ledger=uint32(1), code=uint16(2))
+    account_a = bindings.Account(account_a_id, ledger=LEDGER_1, code=CODE_1)
+    account_b = bindings.Account(account_b_id, ledger=LEDGER_1, code=CODE_2)
     tb_client.create_accounts([account_a, account_b])
 
     transfer_a = bindings.Transfer(
         transfer_a_id,
         debit_account_id=account_a_id,
         credit_account_id=account_b_id,
-        amount=uint64(100),
-        ledger=uint32(1),
-        code=uint16(1),
+        amount=AMOUNT_100,
+        ledger=LEDGER_1,
+        code=CODE_1,
     )
     transfer_b = bindings.Transfer(
         transfer_b_id,
         debit_account_id=account_b_id,
         credit_account_id=account_a_id,
-        amount=uint64(100),
-        ledger=uint32(1),
-        code=uint16(1),
+        amount=AMOUNT_100,
+        ledger=LEDGER_1,
+        code=CODE_1,
     )
     tb_client.create_transfers([transfer_a, transfer_b])
 
@@ -0,0 +1,98 @@
+"""Test the `bindings` module."""
+
+import itertools
+
+import pytest
+
+from tigerbeetle_py import bindings, uint
+
+
+@pytest.mark.parametrize(
+    "bits",
+    list(itertools.product((False, True), repeat=6)),
+)
+def test_transfer_flags_roundtrip(bits: tuple[bool, ...]) -> None:
+    flags = bindings.TransferFlags(*bits)
+    transfer = bindings.Transfer(
+        uint.UInt128(1),
+        debit_account_id=uint.UInt128(1),
+        credit_account_id=uint.UInt128(2),
+        amount=uint.UInt128(1),
+        ledger=uint.UInt32(1),
+        code=uint.UInt16(1),
+        flags=flags.to_uint16(),
+    )
+
+    assert transfer.flags == sum(bit << idx for idx, bit in enumerate(bits))
+    assert transfer.get_flags() == flags
+
+
+@pytest.mark.parametrize(
+    "bits",
+    list(itertools.product((False, True), repeat=4)),
+)
+def test_account_flags_roundtrip(bits: tuple[bool, ...]) -> None:
+    flags = bindings.AccountFlags(*bits)
+    account = bindings.Account(
+        uint.UInt128(1),
+        ledger=uint.UInt32(1),
+        code=uint.UInt16(1),
+        flags=flags.to_uint16(),
+    )
+
+    assert account.get_flags() == flags
+
+
+@pytest.mark.parametrize(
+    "bits",
+    list(itertools.product((False, True), repeat=3)),
+)
+def test_account_filter_flags_roundtrip(bits: tuple[bool, ...]) -> None:
+    flags = bindings.AccountFilterFlags(*bits)
+    filt = bindings.AccountFilter(uint.UInt128(1), flags=flags.to_uint32())
+
+    assert filt.get_flags() == flags
+
+
+@pytest.mark.parametrize(
+    ("table", "enum"),
+    [
+        (bindings._CREATE_ACCOUNT_RESULTS, bindings.CreateAccountResult),
+        (bindings._CREATE_TRANSFER_RESULTS, bindings.CreateTransferResult),
+    ],
+)
+def test_create_result_tables(table: tuple, enum: type) -> None:
+    assert table == tuple(sorted(enum))
+    assert all(table[member] is member for member in enum)
+
+
+def test_account_hashable() -> None:
+    def make() -> bindings.Account:
+        return bindings.Account(
+            uint.UInt128(1), ledger=uint.UInt32(1), code=uint.UInt16(1)
+        )
+
+    assert make() == make()
+    assert len({make(), make()}) == 1
+
+    account = make()
+    account.ledger = uint.UInt32(2)
+    assert account != make()
+    assert hash(account) == hash(
+        bindings.Account(uint.UInt128(1), ledger=uint.UInt32(2), code=uint.UInt16(1))
+    )
+
+
+def test_shared_defaults_unchanged() -> None:
+    def make() -> bindings.Account:
+        return bindings.Account(
+            uint.UInt128(1), ledger=uint.UInt32(1), code=uint.UInt16(1)
+        )
+
+    account = make()
+    account.timestamp += 5
+
+    assert account.timestamp == 5
+    assert make().timestamp == 0
+    assert make().user_data_64 == 0
+    assert bindings.AccountFilter(account_id=uint.UInt128(1)).timestamp_min == 0
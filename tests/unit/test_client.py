@@ -0,0 +1,32 @@
+"""Test the client's decoding helpers."""
+
+import struct
+from collections.abc import Callable
+
+import pytest
+
+from tigerbeetle_py import bindings
+from tigerbeetle_py._client import (
+    unpack_create_accounts_results,
+    unpack_create_transfers_results,
+)
+
+
+def test_unpack_create_results() -> None:
+    data = struct.pack("<II", 1, bindings.CreateAccountResult.EXISTS)
+
+    assert unpack_create_accounts_results(data, 2) == [
+        bindings.CreateAccountsResult(0, bindings.CreateAccountResult.OK),
+        bindings.CreateAccountsResult(1, bindings.CreateAccountResult.EXISTS),
+    ]
+
+
+@pytest.mark.parametrize(
+    "unpack",
+    [unpack_create_accounts_results, unpack_create_transfers_results],
+)
+def test_unpack_unknown_create_result(unpack: Callable[[bytes, int], list]) -> None:
+    data = struct.pack("<II", 0, 1_000)
+
+    with pytest.raises(ValueError, match="1000"):
+        unpack(data, 1)
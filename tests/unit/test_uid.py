@@ -1,5 +1,6 @@
 """Tests for ID()."""
 
+import concurrent.futures
 import threading
 import time
 
@@ -23,6 +24,24 @@ def test_id_locally() -> None:
     verifier()
 
 
+def test_id_random_carry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Verify the random bits increment as a single uint80."""
+    # Pin the timestamp so that the random bits are incremented, not refreshed.
+    monkeypatch.setattr(uid, "ID_LAST_TIMESTAMP", (1 << 48) - 1)
+    monkeypatch.setattr(uid, "ID_LAST_RANDOM", (1 << 64) - 1)
+
+    id_ = uid.ID()
+    assert id_.int & ((1 << 80) - 1) == 1 << 64
+    assert id_.int >> 80 == (1 << 48) - 1
+
+    monkeypatch.setattr(uid, "ID_LAST_RANDOM", (1 << 80) - 1)
+    with pytest.raises(RuntimeError):
+        uid.ID()
+    # The mutex must have been released on the error path.
+    monkeypatch.setattr(uid, "ID_LAST_RANDOM", 0)
+    assert uid.ID().int & ((1 << 80) - 1) == 1
+
+
 @pytest.mark.slow
 def test_id_threads() -> None:
     """Verify monotonic IDs across multiple threads."""
@@ -30,16 +49,11 @@ def test_id_threads() -> None:
     barrier = threading.Barrier(concurrency)
 
     def target():
-        i = threading.get_ident()
-        print(f"Thread {i} started")
         barrier.wait()
-        print(f"Thread {i} running verifier")
         verifier()
-        print(f"Thread {i} finished")
-
-    threads = [threading.Thread(target=target) for _ in range(concurrency)]
-    for thread in threads:
-        thread.start()
 
-    for thread in threads:
-        thread.join()
+    # Unlike bare threads, the futures re-raise a failed verifier in the test.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(target) for _ in range(concurrency)]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
@@ -1,5 +1,10 @@
 """Test the `uint` module."""
 
+import array
+import itertools
+import operator
+from collections.abc import Callable
+
 import pytest
 
 from tigerbeetle_py import uint
@@ -16,7 +21,7 @@ def _uint_cls(request: pytest.FixtureRequest) -> uint.UInt:
 @pytest.fixture(name="value", params=(0, "max"))
 def _value(request: pytest.FixtureRequest, uint_cls: uint.UInt) -> int:
     if request.param == "max":
-        return (1 << uint_cls.n_bits) - 1
+        return uint_cls.max_value
     return request.param
 
 
@@ -35,11 +40,15 @@ def test_init(uint_cls: uint.UInt, value: int) -> None:
         uint_cls(-1)
 
     with pytest.raises(ValueError):
-        uint_cls(1 << uint_cls.n_bits)
+        uint_cls(uint_cls.max_value + 1)
+
+
+def _operand(uint_cls: uint.UInt) -> int:
+    return uint_cls.max_value // 2
 
 
-def test_operators(uint_cls: uint.UInt) -> None:
-    v = (1 << uint_cls.n_bits) // 2 - 1
+def test_equality(uint_cls: uint.UInt) -> None:
+    v = _operand(uint_cls)
     u = uint_cls(v)
 
     assert u == u
@@ -47,42 +56,67 @@ def test_operators(uint_cls: uint.UInt) -> None:
     assert u == int.from_bytes(u.memory, "little")
     assert u == uint_cls(v)
     assert u == uint_cls.from_bytes(u.memory)
-    assert u != v - 1
-    assert u != uint_cls(v - 1)
-    assert u < v + 1
-    assert u < uint_cls(v + 1)
-    assert u <= v
-    assert u <= v + 1
-    assert u <= uint_cls(v)
-    assert u <= uint_cls(v + 1)
-    assert u > v - 1
-    assert u > uint_cls(v - 1)
-    assert u >= v
-    assert u >= v - 1
-    assert u >= uint_cls(v)
-    assert u >= uint_cls(v - 1)
-    assert u + 1 == v + 1
-    assert u + 1 == uint_cls(v + 1)
-    assert u - 1 == v - 1
-    assert u - 1 == uint_cls(v - 1)
-    assert u * 2 == v * 2
-    assert u * 2 == uint_cls(v * 2)
-    assert u // 2 == v // 2
-    assert u // 2 == uint_cls(v // 2)
-    assert u % 2 == v % 2
-    assert u % 2 == uint_cls(v % 2)
-    assert u << 1 == v << 1
-    assert u << 1 == uint_cls(v << 1)
-    assert u >> 1 == v >> 1
-    assert u >> 1 == uint_cls(v >> 1)
-    assert u & 1 == v & 1
-    assert u & 1 == uint_cls(v & 1)
-    assert u | 1 == v | 1
-    assert u | 1 == uint_cls(v | 1)
-    assert u ^ 1 == v ^ 1
-    assert u ^ 1 == uint_cls(v ^ 1)
-
-    # illegal operations
+
+
+@pytest.mark.parametrize(
+    ("op", "delta"),
+    list(
+        itertools.product(
+            (
+                operator.eq,
+                operator.ne,
+                operator.lt,
+                operator.le,
+                operator.gt,
+                operator.ge,
+            ),
+            (-1, 0, 1),
+        )
+    ),
+)
+def test_comparisons(
+    uint_cls: uint.UInt,
+    op: Callable[[object, object], bool],
+    delta: int,
+) -> None:
+    v = _operand(uint_cls)
+    u = uint_cls(v)
+
+    assert op(u, v + delta) is op(v, v + delta)
+    assert op(u, uint_cls(v + delta)) is op(v, v + delta)
+
+
+@pytest.mark.parametrize(
+    ("op", "rhs"),
+    [
+        (operator.add, 1),
+        (operator.sub, 1),
+        (operator.mul, 2),
+        (operator.floordiv, 2),
+        (operator.mod, 2),
+        (operator.lshift, 1),
+        (operator.rshift, 1),
+        (operator.and_, 1),
+        (operator.or_, 1),
+        (operator.xor, 1),
+    ],
+)
+def test_arithmetic(
+    uint_cls: uint.UInt,
+    op: Callable[[object, object], object],
+    rhs: int,
+) -> None:
+    v = _operand(uint_cls)
+    u = uint_cls(v)
+
+    assert op(u, rhs) == op(v, rhs)
+    assert op(u, rhs) == uint_cls(op(v, rhs))
+    assert op(u, uint_cls(rhs)) == uint_cls(op(v, rhs))
+
+
+def test_illegal_operators(uint_cls: uint.UInt) -> None:
+    u = uint_cls(_operand(uint_cls))
+
     with pytest.raises(TypeError):
         u / 2
 
@@ -90,11 +124,62 @@ def test_operators(uint_cls: uint.UInt) -> None:
         ~u
 
 
+def test_init_index(uint_cls: uint.UInt) -> None:
+    assert uint_cls(uint.UInt16(5)) == 5
+    u = uint_cls.from_tuple(uint.UInt16(1), uint.UInt16(2))
+    assert u == uint_cls.from_tuple(1, 2)
+
+    with pytest.raises(TypeError):
+        uint_cls(1.0)
+
+
+def test_iadd(uint_cls: uint.UInt) -> None:
+    u = uint_cls(1)
+    alias = u
+    u += 1
+    u += uint_cls(1)
+
+    assert alias.int == 1
+
+    assert u.int == 3
+    assert int.from_bytes(u.memory, "little") == 3
+    assert u.high == 0
+    assert u.low == 3
+
+    with pytest.raises(OverflowError):
+        u += uint_cls.max_value + 1
+    assert u == 3
+
+
+def test_eq_width() -> None:
+    assert uint.UInt16(1) != uint.UInt32(1)
+    assert uint.UInt16(1) == uint.UInt16(1)
+    assert hash(uint.UInt16(1)) == hash(uint.UInt16(1))
+    assert uint.UInt16(1) == b"\x01\x00"
+    assert uint.UInt16(1) != b"\x01\x00\x00\x00"
+    assert uint.UInt16(1) == bytearray(b"\x01\x00")
+
+
+def test_buffer_operands() -> None:
+    for buf in (b"\x02\x00", bytearray(b"\x02\x00"), memoryview(b"\x02\x00")):
+        assert uint.UInt16(1) + buf == 3
+        assert uint.UInt16(1) < buf
+
+
 def test_from_bytes(uint_cls: uint.UInt) -> None:
-    v = (1 << uint_cls.n_bits) - 1
-    u = uint_cls.from_bytes(v.to_bytes(uint_cls.n_bytes, "little"))
+    v = uint_cls.max_value
+    buf = v.to_bytes(uint_cls.n_bytes, "little")
+    u = uint_cls.from_bytes(buf)
 
     assert int.from_bytes(u.memory, "little") == v
+    assert bytes(u.memory) == buf
+    # Any buffer of the right size is read in place, whatever its item format.
+    assert uint_cls.from_bytes(memoryview(bytearray(buf))) == v
+    assert uint_cls.from_bytes(memoryview(buf).cast("H")) == v
+    assert uint_cls.from_bytes(array.array("B", buf)) == v
+
+    with pytest.raises(TypeError):
+        uint_cls.from_bytes(str(v))
 
     with pytest.raises(ValueError):
         uint_cls.from_bytes(b"\x00" * (uint_cls.n_bytes - 1))
@@ -104,7 +189,7 @@ def test_from_bytes(uint_cls: uint.UInt) -> None:
 
 
 def test_from_tuple(uint_cls: uint.UInt) -> None:
-    v = (1 << uint_cls.n_bits) - 1
+    v = uint_cls.max_value
     u = uint_cls.from_tuple(
         v >> uint_cls.n_bits // 2,
         v & (1 << uint_cls.n_bits // 2) - 1,
@@ -116,4 +201,23 @@ def test_from_tuple(uint_cls: uint.UInt) -> None:
         uint_cls.from_tuple(0, -1)
 
     with pytest.raises(ValueError):
-        uint_cls.from_tuple(1 << uint_cls.n_bits, 0)
+        uint_cls.from_tuple(uint_cls.max_value + 1, 0)
+
+
+def test_from_int(uint_cls: uint.UInt, value: int) -> None:
+    u = uint_cls._from_int(value)
+
+    assert type(u) is uint_cls
+    assert u == uint_cls(value)
+
+
+def test_from_hl(uint_cls: uint.UInt) -> None:
+    v = uint_cls.max_value
+    u = uint_cls._from_hl(
+        v >> uint_cls.n_bits // 2,
+        v & (1 << uint_cls.n_bits // 2) - 1,
+    )
+
+    assert type(u) is uint_cls
+    assert u == uint_cls(v)
+    assert uint_cls._from_hl(1, 2) == uint_cls.from_tuple(1, 2)